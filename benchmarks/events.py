@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the simulator's event records: memory held per pending event, and cost of pushing and popping events on a
+calendar holding a large number of pending events. Events are scheduled and popped through the simulator itself, so
+that the figures account for everything it keeps per pending event (heap entry, event record and index of pending events
+by identifier). They are compared to the scheduling path of greensim 2.3.1, which pushed a dictionary-backed ``_Event``
+instance ordered through ``@total_ordering`` on a plain heap.
+
+Usage: python benchmarks/events.py [num_pending]
+"""
+
+from functools import total_ordering
+from heapq import heappush, heappop
+import os.path
+from random import Random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from greensim import Simulator  # noqa: E402
+
+
+@total_ordering
+class _LegacyEvent:
+
+    def __init__(self, timestamp: float, identifier: int, event: Callable, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self._timestamp = timestamp
+        self._identifier = identifier
+        self._is_cancelled = False
+        self._event = event
+        self._args = args
+        self._kwargs = kwargs
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _LegacyEvent) and self._identifier == other._identifier
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, _LegacyEvent):
+            raise ValueError("Both terms of the comparison must be _LegacyEvent instances.")
+        return (self._timestamp, self._identifier) < (other._timestamp, other._identifier)
+
+
+def nothing() -> None:
+    pass
+
+
+class LegacyCalendar:
+    """
+    Scheduling path of greensim 2.3.1: a counter and a heap of event instances.
+    """
+
+    def __init__(self) -> None:
+        self._events: List[_LegacyEvent] = []
+        self._counter = 0
+        self._ts_now = 0.0
+
+    def schedule(self, delay: float, event: Callable) -> None:
+        heappush(self._events, _LegacyEvent(self._ts_now + delay, self._counter, event))
+        self._counter += 1
+
+    def pop(self) -> float:
+        event = heappop(self._events)
+        self._ts_now = event._timestamp
+        return self._ts_now
+
+
+class SimulatorCalendar:
+    """
+    Scheduling path of the current simulator.
+    """
+
+    def __init__(self) -> None:
+        self._sim = Simulator()
+
+    def schedule(self, delay: float, event: Callable) -> None:
+        self._sim._schedule(delay, event)
+
+    def pop(self) -> float:
+        timestamp, _, _ = self._sim._pop()
+        self._sim._ts_now = timestamp
+        return timestamp
+
+
+def fill(calendar: Any, num_pending: int, rng: Random) -> None:
+    for _ in range(num_pending):
+        calendar.schedule(rng.expovariate(1.0) * num_pending, nothing)
+
+
+def bytes_per_event(make: Callable, num_pending: int) -> float:
+    calendar = make()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fill(calendar, num_pending, Random(1))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del calendar
+    return (after - before) / num_pending
+
+
+def hold_rate(make: Callable, num_pending: int, num_holds: int) -> float:
+    """
+    Classic *hold* model: pop the next event, then schedule a new one further in time, keeping the calendar size
+    constant. Returns the number of hold operations per second.
+    """
+    rng = Random(2)
+    calendar = make()
+    fill(calendar, num_pending, rng)
+    started = time.perf_counter()
+    for _ in range(num_holds):
+        calendar.pop()
+        calendar.schedule(rng.expovariate(1.0) * num_pending, nothing)
+    return num_holds / (time.perf_counter() - started)
+
+
+def main(num_pending: int) -> None:
+    num_holds = 200000
+    print(f"Pending events: {num_pending}")
+    contenders: List[Tuple[str, Callable]] = [("legacy", LegacyCalendar), ("current", SimulatorCalendar)]
+    for label, make in contenders:
+        print(
+            f"{label:>8}: {bytes_per_event(make, num_pending):7.1f} bytes/event -- "
+            f"{hold_rate(make, num_pending, num_holds):10.0f} schedule+pop/s"
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
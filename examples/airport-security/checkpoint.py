@@ -2,7 +2,7 @@ from logging import debug, info, getLogger, basicConfig, INFO
 from statistics import mean, stdev
 from time import time, localtime, strftime
 
-from greensim import Simulator, Process, advance, add, now, local, Queue, Signal, Resource
+from greensim import Simulator, Process, advance, add, now, local, Queue, Signal, Condition, Resource
 import greensim.logging as gs_logging
 from greensim.random import constant, project_int, bounded, uniform, expo, normal, distribution
 from greensim.progress import track_progress, sim_time
@@ -52,7 +52,7 @@ class LuggageBodyScanner(object):
         self._moment_empty = sim.now()
         self._time_empty = 0
         self._travelers_waiting = Queue()
-        self._traveler_ready = Signal()
+        self._traveler_ready = Condition()
         self._agents_working = Signal()
 
         sim.add(self._work_then_break)
@@ -78,7 +78,7 @@ class LuggageBodyScanner(object):
             # Is anybody in there?
             if self._travelers_waiting.is_empty():
                 debug(f"Agent {name}/{self.num} waiting for travelers")
-                self._traveler_ready.turn_off().wait()
+                self._traveler_ready.wait()
                 continue  # Check back if we've gone on break while waiting for somebody.
 
             # Accept the next traveler traversing the checkpoint.
@@ -117,7 +117,7 @@ class LuggageBodyScanner(object):
 
         # Wait for an agent to beckon.
         info(f"Traveler {me} (belt {self.num}) prepared and ready for processing")
-        self._traveler_ready.turn_on()
+        self._traveler_ready.notify()
         self._travelers_waiting.join()
 
         with local.agent.using():  # Make agent busy with me.
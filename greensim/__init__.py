@@ -2,19 +2,26 @@
 Core tools for building simulations.
 """
 
+from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from collections import deque
 from contextlib import contextmanager
-from functools import total_ordering
 from heapq import heappush, heappop, heapify
+from inspect import isgeneratorfunction, iscoroutinefunction
 from logging import getLogger, DEBUG, INFO, WARNING
 from math import inf
-from types import TracebackType
-from typing import cast, Callable, Tuple, List, Iterable, Optional, Dict, Sequence, Mapping, Any, Type
-from uuid import uuid4
+from types import TracebackType, coroutine
+from itertools import chain, count, repeat
+from typing import (
+    cast, Callable, Deque, Tuple, List, Iterable, Iterator, Optional, Dict, Sequence, Mapping, Any, Type, Generator,
+    TypeVar, Union, Hashable
+)
 import weakref
 
 import greenlet
 
-from greensim.tags import Tags, TaggedObject
+from greensim.calendar import Calendar, HeapCalendar
+from greensim.tags import Tags, TaggedObject, _bit, _mask
 
 GREENSIM_TAG_ATTRIBUTE = "_greensim_tags"
 
@@ -23,6 +30,12 @@ GREENSIM_TAG_ATTRIBUTE = "_greensim_tags"
 _logger = None
 
 
+# Process executing at the current moment, along with the simulator it runs in; both are None when no process is
+# executing. Processes set these as they gain control, and clear them before switching away.
+_current: Optional["BaseProcess"] = None
+_current_sim: Optional["Simulator"] = None
+
+
 def enable_logging():
     global _logger
     _logger = getLogger(__name__)
@@ -58,16 +71,27 @@ def _log(level: int, obj: str, name: str, event: str, **params: Any) -> None:
     )
 
 
+# Numbers the objects that are given no name, in the order their name is first read.
+_counter_names = count()
+
+
 class Named:
 
     def __init__(self, name: Optional[str]) -> None:
         super().__init__()
-        self._name = name or str(uuid4())
+        self._name = name or None
 
     @property
     def name(self) -> str:
+        # Default names are only generated once needed: most objects never get their name read, unless auto-logging is
+        # enabled.
+        if self._name is None:
+            self._name = self._default_name()
         return self._name
 
+    def _default_name(self) -> str:
+        return f"{type(self).__name__}-{next(_counter_names)}"
+
     def _log(self, level: int, event: str, **params: Any) -> None:
         _log(level, type(self).__name__, self.name, event, **params)
 
@@ -86,42 +110,43 @@ class Interrupt(Exception):
         return isinstance(other, type(self))
 
 
-@total_ordering
 class _Event:
     """
     Event on a simulation timeline.
+
+    Events are kept compact, as a simulator may hold millions of them at once: the record is slotted, and keyword
+    parameters are only stored when some were given. The simulator's event queue holds ``(timestamp, identifier,
+    event)`` tuples, so that heap operations compare timestamps and identifiers directly; the record itself does not
+    repeat them.
     """
 
-    def __init__(self, timestamp: float, identifier: int, event: Callable, *args: Any, **kwargs: Any) -> None:
-        super().__init__()
-        self._timestamp = timestamp
-        self._identifier = identifier
+    __slots__ = ("_is_cancelled", "_event", "_args", "_kwargs")
+
+    def __init__(self, event: Callable, *args: Any, **kwargs: Any) -> None:
         self._is_cancelled = False
         self._event = event
         self._args = args
-        self._kwargs = kwargs
+        self._kwargs: Optional[Dict[str, Any]] = kwargs or None
+
+    @staticmethod
+    def _make(event: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> "_Event":
+        """
+        Builds an event from already packed parameters, sparing their repacking through the constructor.
+        """
+        ev = _Event.__new__(_Event)
+        ev._is_cancelled = False
+        ev._event = event
+        ev._args = args
+        ev._kwargs = kwargs or None
+        return ev
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, _Event) and \
-            self.timestamp == other.timestamp and \
-            self.identifier == other.identifier and \
+            self.is_cancelled == other.is_cancelled and \
             self.fn == other.fn and \
             self.args == other.args and \
             self.kwargs == other.kwargs
 
-    def __lt__(self, other: object) -> bool:
-        if not isinstance(other, _Event):
-            raise ValueError("Both terms of the comparison must be _Event instances.")
-        return (self._timestamp, self.identifier) < (other._timestamp, other.identifier)
-
-    @property
-    def timestamp(self) -> Optional[float]:
-        return None if self.is_cancelled else self._timestamp
-
-    @property
-    def identifier(self) -> int:
-        return self._identifier
-
     @property
     def is_cancelled(self) -> bool:
         return self._is_cancelled
@@ -136,7 +161,7 @@ class _Event:
 
     @property
     def kwargs(self) -> Mapping[str, Any]:
-        return self._kwargs
+        return self._kwargs or {}
 
     def cancel(self) -> None:
         """
@@ -144,24 +169,34 @@ class _Event:
         """
         self._is_cancelled = True
 
-    def execute(self, sim: "Simulator") -> None:
+    def execute(self, sim: "Simulator", identifier: int) -> None:
         """
-        Executes the event, unless it was cancelled.
+        Executes the event, which bears the given identifier, unless it was cancelled.
         """
         if self._is_cancelled:
             if _logger is not None:
-                _log(DEBUG, "Simulator", sim.name, "cancelled-event", counter=self.identifier, __now=sim.now())
+                _log(DEBUG, "Simulator", sim.name, "cancelled-event", counter=identifier, __now=sim.now())
         else:
             if _logger is not None:
-                _log(DEBUG, "Simulator", sim.name, "exec-event", counter=self.identifier, __now=self.timestamp)
+                _log(DEBUG, "Simulator", sim.name, "exec-event", counter=identifier, __now=sim.now())
             try:
-                self.fn(*self.args, **self.kwargs)
+                if self._kwargs is None:
+                    self._event(*self._args)
+                else:
+                    self._event(*self._args, **self._kwargs)
             except Interrupt:
                 # This happens when interrupting a :py:class:`Process` that has already completed its course, and for
                 # which the greenlet has terminated. We can simply ignore the exception.
                 pass
 
 
+_EventEntry = Tuple[float, int, _Event]
+
+
+def _is_cancelled(entry: _EventEntry) -> bool:
+    return entry[2]._is_cancelled
+
+
 class Simulator(Named):
     """
     This class articulates the dynamic sequence of events that composes a discrete event system.  Its use to synchronize
@@ -198,24 +233,98 @@ class Simulator(Named):
         # ...
 
     Simulation resources and hanging processes are explicitly torn down on context exit.
+
+    Pending events are kept in a binary heap by default. Alternative event calendars, such as the
+    :py:class:`~greensim.calendar.CalendarQueue` and :py:class:`~greensim.calendar.LadderQueue`, may be given through
+    the `scheduler` parameter; they trade a higher constant cost for amortized O(1) hold time when millions of events
+    are pending. Cancelled events (such as the wake-up of an interrupted process) are left in the calendar until they
+    come up, but once they make up more than a fraction `ratio_compaction` of the pending events (and the calendar
+    holds at least `NUM_EVENTS_COMPACTION_MIN` events), the calendar is rebuilt without them. Events scheduled with no
+    delay (resuming or interrupting a process, for instance) skip the calendar altogether: they are queued in arrival
+    order, and drained before any later event.
+
+    While the simulation runs, processes that go into waiting hand control over directly to the process that comes
+    next, when its wake-up is the next event, instead of bouncing through the simulator's own greenlet; a process whose
+    own wake-up comes next simply carries on. This *handoff* mode preserves the order of events, and may be disabled by
+    setting parameter `handoff` to False. It is disabled as well while auto-logging is enabled.
+
+    The simulated clock is a float by default, so that long simulations made of many small delays accumulate rounding
+    error. Setting parameter `ticks_per_unit` rather makes the clock count an integer number of ticks: delays and
+    moments are still expressed in simulated time units, but are rounded to the nearest tick, and the clock advances
+    exactly. Events are then ordered on exact integer timestamps, so long runs are reproducible bit for bit.
+
+    Each process runs on a green thread of its own, which costs a fair bit to set up. Models that churn through many
+    short-lived processes may set parameter `pool_size` to keep up to this number of finished processes parked, instead
+    of letting them die, and reuse them to run the bodies of processes added later on. Tags and local storage are reset
+    on reuse. However, the :py:class:`Process` instance returned by :py:meth:`add` then stands for any body it runs over
+    its lifetime: once a pooled process is done, its instance must no longer be interrupted nor resumed. Alternatively,
+    processes whose body is a generator function or a coroutine function are run without any green thread: see
+    :py:class:`GeneratorProcess`.
     """
 
-    def __init__(self, ts_now: float = 0.0, name: Optional[str] = None) -> None:
+    NUM_EVENTS_COMPACTION_MIN = 256
+
+    def __init__(
+        self,
+        ts_now: float = 0.0,
+        name: Optional[str] = None,
+        scheduler: Optional[Calendar] = None,
+        ratio_compaction: float = 0.5,
+        handoff: bool = True,
+        ticks_per_unit: Optional[int] = None,
+        pool_size: int = 0
+    ) -> None:
         """
         Constructor. Parameter ts_now can be set to the initial value of the simulator's clock; it defaults at 0.0.
+        Parameter scheduler is the (empty) event calendar instance this simulator should use; it defaults to a
+        :py:class:`~greensim.calendar.HeapCalendar`. Parameter ticks_per_unit sets the simulator up with an integer
+        clock of the given resolution (e.g. 10**9 to count time units in nanoseconds). Parameter pool_size is the
+        maximum number of finished processes kept for reuse.
         """
         super().__init__(name)
         self._ts_now = ts_now
-        self._events: List[_Event] = []
+        self._events: Calendar = scheduler if scheduler is not None else HeapCalendar()
+        self._events_now: Deque[_EventEntry] = deque()  # Events scheduled without delay, all at current time.
+        self._index_events: Dict[int, _Event] = {}
+        self._ratio_compaction = ratio_compaction
+        self._num_events_cancelled = 0
+        self._num_compactions = 0
         self._is_running = False
         self._counter = 0
+        self._handoff = handoff
+        self._is_resuming_all = False
+        self._horizon = inf
+        self._counter_horizon = 0
+        self._ticks_per_unit = ticks_per_unit
+        self._counter_processes = 0
+        self._processes_by_tag: Dict[int, Dict[BaseProcess, None]] = {}
+        self._pool: List[Process] = []
+        self._pool_size = pool_size
+        self._num_pool_hits = 0
+        self._num_pool_misses = 0
         self._gr = greenlet.getcurrent()  # The Simulator's greenlet
+        if not 0.0 < ratio_compaction <= 1.0:
+            raise ValueError(f"Compaction ratio must be within (0, 1]; here given {ratio_compaction}.")
+        if ticks_per_unit is not None and not (isinstance(ticks_per_unit, int) and ticks_per_unit > 0):
+            raise ValueError(f"Number of ticks per time unit must be a positive integer; here given {ticks_per_unit}.")
+        if pool_size < 0:
+            raise ValueError(f"Process pool size must be positive; here given {pool_size}.")
+        self._ts_now = self._to_clock(ts_now)
 
     def now(self) -> float:
         """
         Returns the current value of the simulator's clock.
         """
-        return self._ts_now
+        if self._ticks_per_unit is None:
+            return self._ts_now
+        return self._ts_now / self._ticks_per_unit
+
+    @property
+    def ticks_per_unit(self) -> Optional[int]:
+        """
+        Resolution of the simulator's integer clock, in ticks per simulated time unit; None when the clock is a float.
+        """
+        return self._ticks_per_unit
 
     def events(self) -> Iterable[Tuple[Optional[float], Callable, Sequence[Any], Mapping[str, Any]]]:
         """
@@ -224,8 +333,8 @@ class Simulator(Named):
         arbitrary length), and its keyword parameters (as a dictionary).
         """
         return (
-            (event.timestamp, event.fn, event.args, event.kwargs)
-            for event in self._events
+            (self._from_clock(timestamp), event.fn, event.args, event.kwargs)
+            for timestamp, _, event in chain(self._events_now, self._events)
             if not event.is_cancelled
         )
 
@@ -254,17 +363,137 @@ class Simulator(Named):
                 counter=self._counter,
                 __now=self.now()
             )
-        delay = float(delay)
-        if delay < 0.0:
-            raise ValueError("Delay must be positive.")
+        return self._push(self._ts_now + self._clock_delay(delay), event, args, kwargs)
+
+    def _schedule_at(self, moment: float, event: Callable, *args: Any, **kwargs: Any) -> int:
+        """
+        Schedules a one-time event to be run at the given moment on the simulated clock, which cannot be in the past.
+        See method `_schedule()` for more details.
+
+        :return: Unique identifier for the scheduled event.
+        """
+        if _logger is not None:
+            self._log(
+                DEBUG,
+                "schedule",
+                delay=moment - self.now(),
+                fn=event,
+                args=args,
+                kwargs=kwargs,
+                counter=self._counter,
+                __now=self.now()
+            )
+        timestamp = self._to_clock(moment)
+        if timestamp < self._ts_now:
+            raise ValueError("Moment must not be in the past.")
+        return self._push(timestamp, event, args, kwargs)
 
+    def _push(self, timestamp: float, event: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> int:
         # Use counter to strictly order events happening at the same simulated time. This gives a total order on events,
         # working around the heap queue not yielding a stable ordering.
         id_event = self._counter
-        heappush(self._events, _Event(self._ts_now + delay, id_event, event, *args, **kwargs))
+        ev = _Event._make(event, args, kwargs)
+        if timestamp == self._ts_now:
+            self._events_now.append((timestamp, id_event, ev))
+        else:
+            self._events.push((timestamp, id_event, ev))
+        self._index_events[id_event] = ev
         self._counter += 1
         return id_event
 
+    def _to_clock(self, moment: float) -> float:
+        """
+        Converts a moment or duration expressed in simulated time units to the representation of the simulator's
+        clock: a float, or an integer number of ticks when the simulator was set up with a tick resolution.
+        """
+        if self._ticks_per_unit is None or moment == inf:
+            return float(moment)
+        return round(moment * self._ticks_per_unit)
+
+    def _from_clock(self, timestamp: float) -> float:
+        """
+        Converts a moment on the simulator's clock back to simulated time units.
+        """
+        if self._ticks_per_unit is None:
+            return timestamp
+        return timestamp / self._ticks_per_unit
+
+    def _clock_delay(self, delay: float) -> float:
+        """
+        Converts a delay to the representation of the simulator's clock, checking that it is positive.
+        """
+        if delay < 0.0:
+            raise ValueError("Delay must be positive.")
+        return self._to_clock(delay)
+
+    def _schedule_many(self, events: Iterable[Tuple[float, Callable, Sequence[Any]]]) -> List[int]:
+        """
+        Schedules a batch of one-time events, each given as a tuple (delay, event function, positional parameters), as
+        if through `_schedule()`. The whole batch is validated before any event is scheduled, and the events with a
+        positive delay are then loaded into the calendar all at once.
+
+        :return: Unique identifiers for the scheduled events, in the order they were given.
+        """
+        entries_now = []
+        entries = []
+        ts_now = self._ts_now
+        id_event = self._counter
+        for delay, event, args in events:
+            timestamp = ts_now + self._clock_delay(delay)
+            entry = (timestamp, id_event, _Event._make(event, tuple(args), {}))
+            if timestamp == ts_now:
+                entries_now.append(entry)
+            else:
+                entries.append(entry)
+            id_event += 1
+
+        if _logger is not None:
+            self._log(
+                DEBUG,
+                "schedule-many",
+                num_events=id_event - self._counter,
+                counter=self._counter,
+                __now=self.now()
+            )
+        ids_event = list(range(self._counter, id_event))
+        index_events = self._index_events
+        for entry in chain(entries_now, entries):
+            index_events[entry[1]] = entry[2]
+        self._events_now.extend(entries_now)
+        self._events.push_many(entries)
+        self._counter = id_event
+        return ids_event
+
+    def _pop(self) -> _EventEntry:
+        """
+        Takes the entry of the next event out of the event queue, and forgets its identifier.
+        """
+        # Events without delay are all set at the current time, but events of the calendar set for the same moment may
+        # have been scheduled before them.
+        events_now = self._events_now
+        if events_now and not (len(self._events) > 0 and self._events.peek() < events_now[0]):
+            entry = events_now.popleft()
+        else:
+            entry = self._events.pop()
+        _, identifier, event = entry
+        if event._is_cancelled:
+            self._num_events_cancelled -= 1
+        else:
+            del self._index_events[identifier]
+        return entry
+
+    def _peek(self) -> _EventEntry:
+        """
+        Returns the entry of the next event, without taking it out of the event queue.
+        """
+        events_now = self._events_now
+        if events_now and not (len(self._events) > 0 and self._events.peek() < events_now[0]):
+            return events_now[0]
+        return self._events.peek()
+
+    def _num_events(self) -> int:
+        return len(self._events_now) + len(self._events)
+
     def _cancel(self, id_cancel) -> None:
         """
         Cancels a previously scheduled event. This method is private, and is meant for internal usage by the
@@ -272,45 +501,224 @@ class Simulator(Named):
         """
         if _logger is not None:
             self._log(DEBUG, "cancel", id=id_cancel)
-        for event in self._events:
-            if event.identifier == id_cancel:
-                event.cancel()
-                break
+        self._discard(id_cancel)
+
+    def _discard(self, id_cancel: int) -> bool:
+        """
+        Cancels a pending event, compacting the event calendar if cancelled events have become too many. Returns
+        whether the event was indeed pending.
+        """
+        # Events are indexed by identifier until they are popped out of the queue, so cancellation does not depend on
+        # the number of pending events.
+        event = self._index_events.pop(id_cancel, None)
+        if event is None:
+            return False
+        event.cancel()
+        self._num_events_cancelled += 1
+        num_events = self._num_events()
+        if num_events >= self.NUM_EVENTS_COMPACTION_MIN and \
+                self._num_events_cancelled > self._ratio_compaction * num_events:
+            self._compact()
+        return True
 
-    def add(self, fn_process: Callable, *args: Any, **kwargs: Any) -> 'Process':
+    def _compact(self) -> None:
+        """
+        Rebuilds the event calendar without its cancelled events.
+        """
+        if _logger is not None:
+            self._log(DEBUG, "compact", cancelled=self._num_events_cancelled, pending=self._num_events())
+        self._events.discard(_is_cancelled)
+        self._events_now = deque(entry for entry in self._events_now if not _is_cancelled(entry))
+        self._num_events_cancelled = 0
+        self._num_compactions += 1
+
+    @property
+    def num_events_cancelled(self) -> int:
+        """
+        Number of cancelled events still held in the event calendar.
+        """
+        return self._num_events_cancelled
+
+    @property
+    def num_compactions(self) -> int:
+        """
+        Number of times the event calendar has been rebuilt to eliminate cancelled events.
+        """
+        return self._num_compactions
+
+    def add(self, fn_process: Callable, *args: Any, **kwargs: Any) -> 'BaseProcess':
         """
         Adds a process to the simulation. The process is embodied by a function, which will be called with the given
         positional and keyword parameters when the simulation runs. As a process, this function runs on a special green
         thread, and thus will be able to call functions `now()`, `advance()`, `pause()` and `stop()` to articulate its
-        events across the simulated timeline and control the simulation's flow.
+        events across the simulated timeline and control the simulation's flow. A generator function or a coroutine
+        function is rather run as a :py:class:`GeneratorProcess`, which yields or awaits what these functions return
+        instead of waiting on them.
         """
         return self.add_in(0.0, fn_process, *args, **kwargs)
 
-    def add_in(self, delay: float, fn_process: Callable, *args: Any, **kwargs: Any) -> 'Process':
+    def add_in(self, delay: float, fn_process: Callable, *args: Any, **kwargs: Any) -> 'BaseProcess':
         """
         Adds a process to the simulation, which is made to start after the given delay in simulated time.
 
         See method add() for more details.
         """
-        process = Process(self, fn_process, self._gr)
         if _logger is not None:
             self._log(INFO, "add", __now=self.now(), fn=fn_process, args=args, kwargs=kwargs)
+        # Validate the delay before the process is set up, lest a tagged process be indexed while it never runs.
+        self._clock_delay(delay)
+        process, args, kwargs = self._new_process(fn_process, args, kwargs)
         self._schedule(delay, process.switch, *args, **kwargs)
         return process
 
-    def add_at(self, moment: float, fn_process: Callable, *args: Any, **kwargs: Any) -> 'Process':
+    def add_many(
+        self,
+        fn_process: Callable,
+        schedule: Iterable[float],
+        arguments: Optional[Iterable[Sequence[Any]]] = None
+    ) -> List['BaseProcess']:
+        """
+        Adds many instances of a process to the simulation at once, one for each delay of the given schedule, in
+        simulated time. When a sequence of arguments is given along the schedule, each process instance is called with
+        the corresponding positional parameters; instances are added until either the schedule or the arguments run
+        out. This is much faster than successive calls to add_in() when seeding a model with a large number of
+        processes.
+
+        See method add() for more details.
+        """
+        if _logger is not None:
+            self._log(INFO, "add-many", __now=self.now(), fn=fn_process)
+        if arguments is None:
+            arguments = repeat(())
+        batch = list(zip(schedule, arguments))
+        for delay, _ in batch:
+            self._clock_delay(delay)
+        processes = []
+        events = []
+        for delay, args in batch:
+            process, args, _ = self._new_process(fn_process, tuple(args), {})
+            processes.append(process)
+            events.append((delay, process.switch, args))
+        self._schedule_many(events)
+        return processes
+
+    def add_at(self, moment: float, fn_process: Callable, *args: Any, **kwargs: Any) -> 'BaseProcess':
         """
         Adds a process to the simulation, which is made to start at the given exact time on the simulated clock. Note
         that times in the past when compared to the current moment on the simulated clock are forbidden.
 
         See method add() for more details.
         """
-        delay = moment - self.now()
-        if delay < 0.0:
+        if self._to_clock(moment) < self._ts_now:
             raise ValueError(
                 f"The given moment to start the process ({moment:f}) is in the past (now is {self.now():f})."
             )
-        return self.add_in(delay, fn_process, *args, **kwargs)
+        if _logger is not None:
+            self._log(INFO, "add", __now=self.now(), fn=fn_process, args=args, kwargs=kwargs)
+        process, args, kwargs = self._new_process(fn_process, args, kwargs)
+        self._schedule_at(moment, process.switch, *args, **kwargs)
+        return process
+
+    def _new_process(
+        self,
+        fn_process: Callable,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any]
+    ) -> Tuple['BaseProcess', Tuple[Any, ...], Dict[str, Any]]:
+        """
+        Sets up a process to run the given body, reusing one from the pool when possible. Returns the process, along
+        with the parameters its start event should be scheduled with: a pooled process is parked rather than
+        unstarted, so it keeps its parameters to itself and gets resumed with the start token alone. Generator and
+        coroutine functions are rather run as generator processes, which are never pooled.
+        """
+        if isgeneratorfunction(fn_process) or iscoroutinefunction(fn_process):
+            return GeneratorProcess(self, fn_process, *args, **kwargs), (), {}
+        while self._pool:
+            process = self._pool.pop()
+            if process.dead:
+                continue
+            process._setup(self, fn_process)
+            process._args = args
+            process._kwargs = kwargs
+            self._num_pool_hits += 1
+            return process, (_START_BODY,), {}
+        self._num_pool_misses += 1
+        return Process(self, fn_process, self._gr), args, kwargs
+
+    def _recycle(self, process: 'Process') -> bool:
+        """
+        Puts a process whose body has returned into the pool, if there is room left. Returns whether it was pooled.
+        """
+        if len(self._pool) >= self._pool_size:
+            return False
+        process._body = None
+        self._pool.append(process)
+        return True
+
+    @property
+    def num_pool_hits(self) -> int:
+        """
+        Number of processes added to the simulation by reusing a pooled process.
+        """
+        return self._num_pool_hits
+
+    @property
+    def num_pool_misses(self) -> int:
+        """
+        Number of processes added to the simulation for which a new process had to be created.
+        """
+        return self._num_pool_misses
+
+    def _index_tags(self, process: 'BaseProcess', tags_before: int, tags_after: int) -> None:
+        """
+        Updates the index of live processes by tag, as the given process goes from one set of tags to another (both
+        expressed as bitmasks).
+        """
+        index = self._processes_by_tag
+        dropped = tags_before & ~tags_after
+        while dropped:
+            bit = dropped & -dropped
+            processes = index.get(bit)
+            if processes is not None:
+                processes.pop(process, None)
+            dropped ^= bit
+        added = tags_after & ~tags_before
+        while added:
+            bit = added & -added
+            index.setdefault(bit, {})[process] = None
+            added ^= bit
+
+    def processes_tagged(self, tag: Tags) -> List['BaseProcess']:
+        """
+        Returns the live processes of this simulation carrying the given tag, in the order they got it. Processes are
+        live from the moment they are added to the simulation until their body returns.
+        """
+        processes = self._processes_by_tag.get(_bit(tag))
+        if not processes:
+            return []
+        # Processes torn down before they could start never got to leave the index.
+        dead = [process for process in processes if process.dead]
+        for process in dead:
+            del processes[process]
+        return list(processes)
+
+    def num_processes_tagged(self, tag: Tags) -> int:
+        """
+        Returns the number of live processes of this simulation carrying the given tag.
+        """
+        return len(self.processes_tagged(tag))
+
+    def interrupt_tagged(self, tag: Tags, inter: Optional[Interrupt] = None) -> int:
+        """
+        Interrupts all live processes of this simulation carrying the given tag. Returns the number of processes
+        interrupted.
+
+        See method :py:meth:`Process.interrupt` for more details.
+        """
+        processes = self.processes_tagged(tag)
+        for process in processes:
+            process.interrupt(inter)
+        return len(processes)
 
     def run(self, duration: float = inf) -> None:
         """
@@ -319,39 +727,153 @@ class Simulator(Named):
         """
         if _logger is not None:
             self._log(INFO, "run", __now=self.now(), duration=duration)
-        counter_stop_event = None
-        if duration != inf:
-            counter_stop_event = self._counter
-            self._schedule(duration, self.stop)
+        if duration < 0.0:
+            raise ValueError("Duration must be positive.")
+        self._run_until(self._ts_now + self._to_clock(duration))
 
+    def run_until(self, moment: float) -> None:
+        """
+        Runs the simulation until a stopping condition is met (no more events, or an event invokes method stop()), or
+        until the simulated clock hits the given moment. Moments in the past are forbidden.
+        """
+        if _logger is not None:
+            self._log(INFO, "run-until", __now=self.now(), moment=moment)
+        horizon = self._to_clock(moment)
+        if horizon < self._ts_now:
+            raise ValueError(f"The given moment to run until ({moment:f}) is in the past (now is {self.now():f}).")
+        self._run_until(horizon)
+
+    def _run_until(self, horizon: float) -> None:
+        # Stopping at the horizon behaves as if a stop event was scheduled for it at the moment the simulation starts
+        # running: events already scheduled for the horizon run, those scheduled for it in the meantime do not. Unless
+        # the simulation gets stopped earlier, the clock is then set to the horizon.
+        global _current, _current_sim
+        self._horizon = horizon
+        self._counter_horizon = counter_horizon = self._counter
         self._is_running = True
-        while self.is_running and len(self._events) > 0:
-            event = heappop(self._events)
-            self._ts_now = event.timestamp or self._ts_now
-            event.execute(self)
+        # The simulation may be run from a process of another simulation: keep track of it, so as to restore it as the
+        # current process.
+        current = _current
+        current_sim = _current_sim
+        _current = _current_sim = None
+        try:
+            while self._is_running and (self._events_now or len(self._events) > 0):
+                if horizon < inf:
+                    timestamp, identifier, _ = self._peek()
+                    if timestamp > horizon or (timestamp == horizon and identifier >= counter_horizon):
+                        break
+                timestamp, identifier, event = self._pop()
+                if not event._is_cancelled:
+                    self._ts_now = timestamp
+                event.execute(self, identifier)
+        finally:
+            _current = current
+            _current_sim = current_sim
 
-        if len(self._events) == 0:
+        if self._is_running and horizon < inf:
+            self._ts_now = horizon
+        if self._num_events() == 0:
             if _logger is not None:
                 self._log(DEBUG, "out-of-events", __now=self.now())
         self.stop()
 
-        if counter_stop_event is not None:
-            # Change the planned stop to a no-op. We would rather eliminate it, but this would force a re-sort of the
-            # event queue.
-            for (i, event) in enumerate(self._events):
-                if event.identifier == counter_stop_event:
-                    if _logger is not None:
-                        self._log(DEBUG, "cancel-stop", counter=counter_stop_event)
-                    event.cancel()
+    def _is_handing_off(self) -> bool:
+        return self._handoff and self._is_running and not self._is_resuming_all and _logger is None
+
+    def _advance_in_place(self, delay: float) -> bool:
+        """
+        When handing off, and the wake-up of a process advancing by the given delay would be the next event, moves the
+        clock forward to this wake-up and returns True: the process can carry on without ever waiting. Otherwise,
+        returns False.
+        """
+        if not self._is_handing_off() or self._events_now:
+            return False
+        if delay < 0.0:
+            return False
+        timestamp = self._ts_now + self._to_clock(delay)
+        if timestamp >= self._horizon or (len(self._events) > 0 and self._events.peek()[0] <= timestamp):
+            return False
+        self._counter += 1  # Spent on the wake-up that did not need to be scheduled.
+        self._ts_now = timestamp
+        return True
+
+    def _hand_off(self, process: "Process") -> Optional[Tuple[Callable, Sequence[Any], Mapping[str, Any]]]:
+        """
+        Determines where the given process, which has just gone into waiting, should switch to: if the next event is the
+        wake-up of another process, it may switch straight to it, after the event is taken out of the event queue.
+        Otherwise, it goes back to the simulator's greenlet. Returns None when the next event is the wake-up of this
+        very process, which then carries on; else returns the switch method with its positional and keyword parameters.
+
+        This returns the switch to perform rather than performing it, so that the waiting process does not hold a
+        reference to the simulator in the meantime.
+        """
+        if self._is_handing_off():
+            while self._events_now or len(self._events) > 0:
+                timestamp, identifier, event = self._peek()
+                if timestamp > self._horizon or (timestamp == self._horizon and identifier >= self._counter_horizon):
+                    break
+                if event._is_cancelled:
+                    self._pop()
+                    continue
+                fn = event._event
+                target = getattr(fn, "__self__", None)
+                if not isinstance(target, Process) or fn.__name__ != "switch":
                     break
+                if not target and not target.dead:
+                    # A green thread started from another one would pile up on its recursion depth: let the
+                    # simulator's greenlet start it.
+                    break
+                self._pop()
+                self._ts_now = timestamp
+                if target is process:
+                    return None
+                if not target.dead:
+                    return fn, event._args, event.kwargs
+        return self._gr.switch, (), {}
+
+    def _resume_all(self, processes: List["BaseProcess"]) -> None:
+        """
+        Event resuming the given processes one after the other, as if each had a wake-up event of its own scheduled at
+        this moment. Processes are not handed off to one another nor to later events in the meantime: each one comes
+        back to this event as soon as it waits again.
+        """
+        is_resuming_all = self._is_resuming_all
+        self._is_resuming_all = True
+        remaining = iter(processes)
+        try:
+            for process in remaining:
+                process.switch()
+        finally:
+            self._is_resuming_all = is_resuming_all
+            # Should a process fail, the others still get resumed.
+            for process in remaining:
+                self._schedule(0.0, process.switch)
 
     def step(self) -> None:
         """
         Runs a single event of the simulation.
         """
-        event = heappop(self._events)
-        self._ts_now = event.timestamp or self._ts_now
-        event.execute(self)
+        global _current, _current_sim
+        timestamp, identifier, event = self._pop()
+        if not event._is_cancelled:
+            self._ts_now = timestamp
+        current = _current
+        current_sim = _current_sim
+        _current = _current_sim = None
+        try:
+            event.execute(self, identifier)
+        finally:
+            _current = current
+            _current_sim = current_sim
+
+    @staticmethod
+    def current() -> "Simulator":
+        """
+        Returns the simulator running the process that is executing at the current moment.
+        """
+        if _current_sim is None:
+            raise TypeError("Current greenlet does not correspond to a Process instance.")
+        return _current_sim
 
     def stop(self) -> None:
         """
@@ -374,11 +896,28 @@ class Simulator(Named):
         Resets the internal state of the simulator, and sets the simulated clock back to 0.0. This discards all
         outstanding events and tears down hanging process instances.
         """
-        for _, event, _, _ in self.events():
-            if hasattr(event, "__self__") and isinstance(event.__self__, Process):  # type: ignore
-                event.__self__.throw()                                              # type: ignore
+        for _, event, args, _ in self.events():
+            owners = args[0] if event == self._resume_all else [getattr(event, "__self__", None)]
+            for owner in owners:
+                if isinstance(owner, BaseProcess):
+                    owner.throw()
         self._events.clear()
-        self._ts_now = 0.0
+        self._events_now.clear()
+        self._index_events.clear()
+        self._num_events_cancelled = 0
+        self._ts_now = self._to_clock(0.0)
+        pool, self._pool = self._pool, []
+        for process in pool:
+            # Pooled processes are children of the simulator's greenlet: this may run while a process of another
+            # simulation executes (e.g. as the simulator gets garbage-collected), to which control must come back.
+            if not process.dead:
+                try:
+                    process.parent = greenlet.getcurrent()
+                except RuntimeError:
+                    # The current greenlet is being finalized, as the interpreter exits: so are the pooled ones.
+                    continue
+                process.throw()
+        self._processes_by_tag.clear()
 
     def __enter__(self) -> "Simulator":
         return self
@@ -401,120 +940,237 @@ class Simulator(Named):
 
 class _TreeLocalParam:
     """
-    Growing object for which arbitrary attributes can be set and gotten back.
+    Growing object for which arbitrary attributes can be set and gotten back. Reading an attribute that was never set
+    yields a placeholder, which only gets stored as a new node once an attribute is set on it in turn.
     """
 
     def __getattr__(self, name: str) -> Any:
-        return self._get().__dict__.setdefault(name, _TreeLocalParam())
+        return _MissingParam(self, name)
 
     def __setattr__(self, name: str, value: Any) -> None:
-        self._get().__dict__[name] = value
+        self.__dict__[name] = value
 
     def __delattr__(self, name: str) -> None:
-        del self._get().__dict__[name]
+        del self.__dict__[name]
 
-    def _get(self) -> "_TreeLocalParam":
-        return self
 
+def _local_node(parent: Any, name: str) -> Any:
+    """
+    Returns the value of the given attribute of a local storage object, setting it to a new node if it is not set.
+    """
+    if isinstance(parent, _MissingParam):
+        parent = parent._materialize()
+    if isinstance(parent, _ProcessLocal):
+        return parent._params_dict().setdefault(name, _TreeLocalParam())
+    return parent.__dict__.setdefault(name, _TreeLocalParam())
 
-class _TreeLocalParamCurrent(_TreeLocalParam):
 
-    def _get(self) -> "_TreeLocalParam":
-        return Process.current().local
+class _MissingParam:
+    """
+    Placeholder for an attribute of local storage that was read without having been set.
+    """
 
-    def __setattr__(self, name: str, value: Any) -> Any:
-        if _logger is not None and name == "name":
-            _log(DEBUG, "Process", self.name, "rename", new=value)
-        super().__setattr__(name, value)
+    __slots__ = ("_parent", "_name")
 
+    def __init__(self, parent: Any, name: str) -> None:
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_name", name)
 
-local = _TreeLocalParamCurrent()
+    def _materialize(self) -> Any:
+        return _local_node(self._parent, self._name)
+
+    def _resolve(self) -> Any:
+        """
+        Returns the value stored in place of this placeholder since it was read, if any, so that reads through a kept
+        placeholder see what was set through it; returns the placeholder itself otherwise.
+        """
+        parent = self._parent
+        if isinstance(parent, _MissingParam):
+            parent = parent._resolve()
+            if isinstance(parent, _MissingParam):
+                return self
+        if isinstance(parent, _ProcessLocal):
+            return (parent._params or {}).get(self._name, self)
+        if isinstance(parent, _TreeLocalParam):
+            return parent.__dict__.get(self._name, self)
+        return getattr(parent, self._name, self)
+
+    def __getattr__(self, name: str) -> Any:
+        node = self._resolve()
+        if node is self:
+            return _MissingParam(self, name)
+        return getattr(node, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._materialize(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        node = self._resolve()
+        if node is self:
+            raise AttributeError(name)
+        delattr(node, name)
 
 
-class Process(greenlet.greenlet, TaggedObject):
+class _ProcessLocal:
+    """
+    Local storage of a process. The process is named after its number in the simulation if it is not given a name of
+    its own; this name is only generated once read. Other attributes are stored in a dictionary created once the first
+    of them is set.
     """
-    Processes are green threads transparently used to mix the concurrent execution of multiple functions that generate
-    trains of events. A simulation's writer typically does not have to care for processes: their management is
-    transparent through the usage of Queues, Signals and Resources. However, if one uses methods pause() to implement a
-    queueing or interruption mechanism of their own, they become responsible with resuming the stopped processes, by
-    invoking their method `resume()`.
 
-    Through their `local` public data member, processes may store arbitrary values that can be then manipulated by other
-    processes (no risk of race condition). This is useful for implementing non-trivial queue disciplines, for instance.
+    __slots__ = ("_number", "_name", "_params")
 
-    For a description of why the _bind_and_call_constructor method is necessary and what it does, see get_binding.md
+    def __init__(self, number: int) -> None:
+        object.__setattr__(self, "_number", number)
+        object.__setattr__(self, "_name", None)
+        object.__setattr__(self, "_params", None)
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            object.__setattr__(self, "_name", f"process-{self._number}")
+        return cast(str, self._name)
+
+    def _params_dict(self) -> Dict[str, Any]:
+        if self._params is None:
+            object.__setattr__(self, "_params", {})
+        return cast(Dict[str, Any], self._params)
+
+    def __getattr__(self, name: str) -> Any:
+        params = self._params
+        if params is not None and name in params:
+            return params[name]
+        return _MissingParam(self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "name":
+            object.__setattr__(self, "_name", value)
+        else:
+            self._params_dict()[name] = value
+
+    def __delattr__(self, name: str) -> None:
+        params = self._params
+        if params is None or name not in params:
+            raise AttributeError(name)
+        del params[name]
+
+
+class _TreeLocalParamCurrent:
+    """
+    Stands for the local storage of the process executing at the current moment.
     """
 
-    def __init__(self, sim: Simulator, body: Callable, parent: greenlet.greenlet) -> None:
-        global GREENSIM_TAG_ATTRIBUTE
+    __slots__ = ()
 
-        # Ignore type since Python correctly calls greenlet.greenlet.__init__(),
-        # but the type checker compares to TaggedObject.__init__()
-        super().__init__(self._run, parent)  # type: ignore
-        self._bind_and_call_constructor(TaggedObject)
-        self._bind_and_call_constructor(greenlet.greenlet, self._run, parent)
-        self._body = body
-        self.rsim = weakref.ref(sim)
-        self.local = _TreeLocalParam()
-        self.local.name = str(uuid4())
-        # Collect tags from the process spawning this one, and anything attached to the function
-        if Process.current_exists():
-            self.tag_with(*Process.current()._tag_set)
+    def __getattr__(self, name: str) -> Any:
+        return getattr(Process.current().local, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        local = Process.current().local
+        if _logger is not None and name == "name":
+            _log(DEBUG, "Process", local.name, "rename", new=value)
+        setattr(local, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(Process.current().local, name)
 
-        if hasattr(body, GREENSIM_TAG_ATTRIBUTE):
-            self.tag_with(*getattr(body, GREENSIM_TAG_ATTRIBUTE))
 
-    def _run(self, *args: Any, **kwargs: Any) -> None:
+local = _TreeLocalParamCurrent()
+
+
+class BaseProcess(TaggedObject, ABC):
+    """
+    Common ground of the processes of a simulation, whichever way they run: on green threads of their own, as
+    :py:class:`Process` instances, or as generators the simulator steps through, as :py:class:`GeneratorProcess`
+    instances. Processes of either kind carry tags and local storage, and get resumed and interrupted alike.
+    """
+
+    __slots__ = ()
+
+    rsim: Callable[[], Optional[Simulator]]
+    local: _ProcessLocal
+    _queues_selected: Tuple["Queue", ...]  # Queues of the signals the process selects among.
+
+    def _setup(self, sim: Simulator, body: Callable) -> None:
         """
-        Wraps around the process body (the function that implements a process within the simulation) so as to catch the
-        eventual Interrupt that may terminate the process.
+        Sets the process up to run the given body, with fresh local storage. The process is named after its number in
+        the simulation, unless it is later given a name.
         """
-        try:
-            self._body(*args, **kwargs)
-            if _logger is not None:
-                _log(INFO, "Process", self.local.name, "die-finish")
-        except Interrupt:
-            if _logger is not None:
-                _log(INFO, "Process", self.local.name, "die-interrupt")
+        self.local = _ProcessLocal(sim._counter_processes)
+        sim._counter_processes += 1
+        # Collect tags from the process spawning this one, and anything attached to the function
+        tags = 0 if _current is None else _current._tags
+        tags_body = getattr(body, GREENSIM_TAG_ATTRIBUTE, None)
+        if tags_body is not None:
+            tags |= _mask(tags_body)
+        self._tags = tags
+        if tags:
+            sim._index_tags(self, 0, tags)
 
-    def _bind_and_call_constructor(self, t: type, *args) -> None:
+    @property
+    @abstractmethod
+    def dead(self) -> bool:
         """
-        Accesses the __init__ method of a type directly and calls it with *args
+        Tells whether the process is done running its body.
+        """
+        pass
 
-        This allows the constructors of both superclasses to be called, as described in get_binding.md
+    @abstractmethod
+    def switch(self, value: Any = None) -> Any:
+        """
+        Resumes the process, carrying on from where it waits.
+        """
+        pass
 
-        This could be done using two calls to super() with a hack based on how Python searches __mro__:
+    @abstractmethod
+    def throw(self, exc: Optional[BaseException] = None) -> Any:
+        """
+        Resumes the process by raising the given exception where it waits. If no exception is given, the process is
+        rather torn down.
+        """
+        pass
 
-        ```
-        super().__init__(run, parent) # calls greenlet.greenlet.__init__
-        super(greenlet.greenlet, self).__init__() # calls TaggedObject.__init__
-        ```
+    def _is_live(self) -> bool:
+        """
+        Tells whether the process is still running its body.
+        """
+        return not self.dead
 
-        Python will always find greenlet.greenlet first since it is specified first, but will ignore it if it is
-        the first argument to super, which is meant to indicate the subclass and thus is not meant to be called on
+    def _retag(self, tags: int) -> None:
+        """
+        Sets the tags of the process, keeping the simulator's index of live processes by tag up to date.
+        """
+        tags_before = self._tags
+        self._tags = tags
+        if tags != tags_before and self._is_live():
+            sim = self.rsim()
+            if sim is not None:
+                sim._index_tags(self, tags_before, tags)
 
-        See: https://docs.python.org/3.7/library/functions.html#super
+    def tag_with(self, *new_tags: Tags) -> None:
+        self._retag(self._tags | _mask(new_tags))
 
-        This is indirect, confusing, and not in following with the purpose of super(), so the direct method was used
-        """
-        t.__init__.__get__(self)(*args)  # type: ignore
+    def untag(self, *drop_tags: Tags) -> None:
+        self._retag(self._tags & ~_mask(drop_tags))
+
+    def clear_tags(self) -> None:
+        self._retag(0)
 
     @staticmethod
-    def current() -> 'Process':
+    def current() -> 'BaseProcess':
         """
         Returns the instance of the process that is executing at the current moment.
         """
-        curr = greenlet.getcurrent()
-        if not isinstance(curr, Process):
+        if _current is None:
             raise TypeError("Current greenlet does not correspond to a Process instance.")
-        return cast(Process, greenlet.getcurrent())
+        return _current
 
     @staticmethod
     def current_exists() -> bool:
         """
         Convenience method to allow conditional logic without try-except
         """
-        return isinstance(greenlet.getcurrent(), Process)
+        return _current is not None
 
     def resume(self) -> None:
         """
@@ -549,17 +1205,338 @@ class Process(greenlet.greenlet, TaggedObject):
         self.rsim()._schedule(0.0, self.throw, inter)  # type: ignore
 
 
-def pause() -> None:
+class Process(greenlet.greenlet, BaseProcess):
+    """
+    Processes are green threads transparently used to mix the concurrent execution of multiple functions that generate
+    trains of events. A simulation's writer typically does not have to care for processes: their management is
+    transparent through the usage of Queues, Signals and Resources. However, if one uses methods pause() to implement a
+    queueing or interruption mechanism of their own, they become responsible with resuming the stopped processes, by
+    invoking their method `resume()`.
+
+    Through their `local` public data member, processes may store arbitrary values that can be then manipulated by other
+    processes (no risk of race condition). This is useful for implementing non-trivial queue disciplines, for instance.
+
+    For a description of why the _bind_and_call_constructor method is necessary and what it does, see get_binding.md
+    """
+
+    # The whole state of processes is slotted, so that the green thread's instance dictionary never gets created.
+    __slots__ = (
+        "rsim",
+        "local",
+        "_body",
+        "_args",
+        "_kwargs",
+        "_context_teardown",
+        "_tags",
+        "_queues_selected"
+    )
+
+    def __init__(self, sim: Simulator, body: Callable, parent: greenlet.greenlet) -> None:
+        # Ignore type since Python correctly calls greenlet.greenlet.__init__(),
+        # but the type checker compares to TaggedObject.__init__()
+        super().__init__(self._run, parent)  # type: ignore
+        self._bind_and_call_constructor(TaggedObject)
+        self._bind_and_call_constructor(greenlet.greenlet, self._run, parent)
+        self.rsim = weakref.ref(sim)
+        self._args: Tuple[Any, ...] = ()
+        self._kwargs: Dict[str, Any] = {}
+        self._context_teardown: Tuple[Optional[BaseProcess], Optional[Simulator]] = (None, None)
+        self._queues_selected: Tuple[Queue, ...] = ()
+        self._setup(sim, body)
+
+    def _setup(self, sim: Simulator, body: Callable) -> None:
+        self._body: Optional[Callable] = body
+        super()._setup(sim, body)
+
+    def _is_live(self) -> bool:
+        return self._body is not None and not self.dead
+
+    def _run(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Wraps around the process body (the function that implements a process within the simulation) so as to catch the
+        eventual Interrupt that may terminate the process. Once the body returns, the process may get parked in the
+        simulator's pool, to be later resumed so as to run another body.
+        """
+        global _current, _current_sim
+        _current = self
+        _current_sim = self.rsim()
+        try:
+            while True:
+                try:
+                    self._body(*args, **kwargs)  # type: ignore
+                    if _logger is not None:
+                        _log(INFO, "Process", self.local.name, "die-finish")
+                except Interrupt:
+                    if _logger is not None:
+                        _log(INFO, "Process", self.local.name, "die-interrupt")
+
+                args = ()
+                kwargs = {}
+                rsim = self.rsim()
+                if rsim is None:
+                    return
+                rsim._index_tags(self, self._tags, 0)
+                if not rsim._recycle(self):
+                    return
+                del rsim
+                # Stale resumptions and interruptions may still be aimed at the body the process used to run, even once
+                # it has been handed its next body: only the event starting this body, with its token, resumes it.
+                while True:
+                    try:
+                        if _wait(self) is _START_BODY:
+                            break
+                    except Interrupt:
+                        pass
+                args, kwargs = self._args, self._kwargs
+                self._args = ()
+                self._kwargs = {}
+        finally:
+            rsim = self.rsim()
+            if rsim is not None:
+                rsim._index_tags(self, self._tags, 0)
+            del rsim
+            _current, _current_sim = self._context_teardown
+            self._context_teardown = (None, None)
+
+    def _bind_and_call_constructor(self, t: type, *args) -> None:
+        """
+        Accesses the __init__ method of a type directly and calls it with *args
+
+        This allows the constructors of both superclasses to be called, as described in get_binding.md
+
+        This could be done using two calls to super() with a hack based on how Python searches __mro__:
+
+        ```
+        super().__init__(run, parent) # calls greenlet.greenlet.__init__
+        super(greenlet.greenlet, self).__init__() # calls TaggedObject.__init__
+        ```
+
+        Python will always find greenlet.greenlet first since it is specified first, but will ignore it if it is
+        the first argument to super, which is meant to indicate the subclass and thus is not meant to be called on
+
+        See: https://docs.python.org/3.7/library/functions.html#super
+
+        This is indirect, confusing, and not in following with the purpose of super(), so the direct method was used
+        """
+        t.__init__.__get__(self)(*args)  # type: ignore
+
+
+class GeneratorProcess(BaseProcess):
+    """
+    Processes whose body is a generator function, which the simulator steps through directly instead of running it on a
+    green thread of its own. They are much lighter than green thread processes, both to hold in memory and to switch
+    to: they suit models made of many simple entities. The simulator makes such a process of any generator function
+    given to :py:meth:`Simulator.add`, as well as of any coroutine function (defined with ``async def``).
+
+    Where green thread processes call functions such as :py:func:`advance` and :py:func:`pause`, or methods such as
+    :py:meth:`Queue.join`, :py:meth:`Signal.wait` and :py:meth:`Resource.take`, which return once the wait is over, a
+    generator process yields what these functions return, and is resumed at the end of the wait with their result::
+
+        def customer(counter: Resource):
+            yield advance(3.0)
+            yield counter.take()
+            yield 5.0  # Same as yielding advance(5.0).
+            counter.release()
+
+    Yielding a number is thus the same as yielding :py:func:`advance` of this delay. Yielding ``None`` pauses the
+    process, as :py:func:`pause` does. Generator processes may also yield another generator, which is then run as part
+    of the process; this allows one to compose the body of a process out of several generator functions. Remark that
+    a generator process cannot hold resource instances through :py:meth:`Resource.using`: it should rather explicitly
+    :py:meth:`Resource.take` and :py:meth:`Resource.release` them.
+
+    Coroutine bodies rather await what these functions return, and may await other coroutines. They are driven on the
+    simulated clock alone: no asyncio event loop is involved, so they cannot await asyncio objects::
+
+        async def customer(counter: Resource):
+            await advance(3.0)
+            await counter.take()
+            await advance(5.0)
+            counter.release()
+    """
+
+    __slots__ = ("rsim", "local", "_tags", "_queues_selected", "_stack")
+
+    def __init__(self, sim: Simulator, body: Callable, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.rsim = weakref.ref(sim)
+        self._queues_selected: Tuple[Queue, ...] = ()
+        self._setup(sim, body)
+        # Generators the process is running, each one yielded by the previous one.
+        self._stack: List[Generator] = [body(*args, **kwargs)]
+
+    @property
+    def dead(self) -> bool:
+        return not self._stack
+
+    def switch(self, value: Any = None) -> None:
+        self._step(value, None)
+
+    def throw(self, exc: Optional[BaseException] = None) -> None:
+        if exc is None:
+            self._tear_down()
+        else:
+            self._step(None, exc)
+            # Once handled, the exception must let go of the frames it was thrown from: the simulator is referenced from
+            # these frames, so it would be kept alive by this exception, held in the event that threw it.
+            exc.__traceback__ = None
+
+    def _step(self, value: Any, exc: Optional[BaseException]) -> None:
+        """
+        Runs the process until it yields a wait, or its body returns.
+        """
+        global _current, _current_sim
+        stack = self._stack
+        if not stack:
+            return
+        current = _current
+        current_sim = _current_sim
+        _current = self
+        _current_sim = self.rsim()
+        try:
+            while True:
+                try:
+                    if exc is None:
+                        waiting = stack[-1].send(value)
+                    else:
+                        waiting = stack[-1].throw(exc)
+                except StopIteration as stop:
+                    stack.pop()
+                    value = stop.value
+                    exc = None
+                except Exception as err:
+                    stack.pop()
+                    value = None
+                    exc = err
+                else:
+                    if waiting is None:
+                        return
+                    value = exc = None
+                    if isinstance(waiting, (float, int)):
+                        waiting = advance(waiting)
+                    if hasattr(waiting, "send") and hasattr(waiting, "throw"):
+                        stack.append(waiting)
+                    else:
+                        exc = TypeError(f"Generator process cannot wait on {waiting!r}.")
+                    continue
+
+                if not stack:
+                    sim = self.rsim()
+                    if sim is not None:
+                        sim._index_tags(self, self._tags, 0)
+                    del sim
+                    if exc is None:
+                        if _logger is not None:
+                            _log(INFO, "Process", self.local.name, "die-finish")
+                    elif isinstance(exc, Interrupt):
+                        if _logger is not None:
+                            _log(INFO, "Process", self.local.name, "die-interrupt")
+                    else:
+                        raise exc
+                    return
+        finally:
+            exc = None  # Not to be part of a reference cycle with its traceback.
+            _current = current
+            _current_sim = current_sim
+
+    def _tear_down(self) -> None:
+        """
+        Closes the generators of the process, so that their clean-up code runs.
+        """
+        global _current, _current_sim
+        current = _current
+        current_sim = _current_sim
+        _current = self
+        _current_sim = self.rsim()
+        try:
+            stack = self._stack
+            while stack:
+                stack.pop().close()
+            sim = _current_sim
+            if sim is not None:
+                sim._index_tags(self, self._tags, 0)
+            del sim
+        finally:
+            _current = current
+            _current_sim = current_sim
+
+
+_Wait = Generator[None, Any, Any]
+_WaitFunction = TypeVar("_WaitFunction", bound=Callable[..., _Wait])
+
+
+def _coroutine(fn: _WaitFunction) -> _WaitFunction:
+    """
+    Flags the given generator function as a generator-based coroutine, so that the waits it makes can be awaited from
+    coroutine processes, on top of being yielded from generator processes.
+    """
+    return cast(_WaitFunction, coroutine(fn))
+
+
+def _waitable(wait: _Wait) -> Any:
+    """
+    Hands the given wait over to the current process: a generator process gets it back, so that it yields it, while a
+    green thread process goes through it right away, being paused whenever it yields.
+    """
+    if isinstance(_current, GeneratorProcess):
+        return wait
+    curr = cast(Process, Process.current())
+    try:
+        wait.send(None)
+        while True:
+            try:
+                _wait(curr)
+            except BaseException as err:
+                wait.throw(err)
+            else:
+                wait.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+
+def pause() -> Optional[_Wait]:
     """
     Pauses the current process indefinitely -- it will require another process to `resume()` it. When this resumption
     happens, the process returns from this function.
     """
+    return _waitable(_pausing())
+
+
+@_coroutine
+def _pausing() -> _Wait:
     if _logger is not None:
         _log(INFO, "Process", local.name, "pause")
-    Process.current().rsim()._gr.switch()  # type: ignore
+    yield
+
+
+# Passed to a pooled process by the event starting its next body, to tell this event apart from stale ones.
+_START_BODY = object()
 
 
-def advance(delay: float) -> None:
+def _wait(curr: Process) -> Any:
+    """
+    Switches away from the current process, which is going into waiting. Returns the value the process is switched
+    back to with.
+    """
+    global _current, _current_sim
+    switch = cast(Simulator, _current_sim)._hand_off(curr)
+    if switch is not None:
+        fn, args, kwargs = switch
+        del switch
+        _current = _current_sim = None
+        try:
+            return fn(*args, **kwargs)
+        except greenlet.GreenletExit:
+            # Torn down, possibly as it gets garbage-collected while another process executes: the current process
+            # must be restored once this one is dead.
+            curr._context_teardown = (_current, _current_sim)
+            raise
+        finally:
+            _current = curr
+            _current_sim = curr.rsim()
+    return None
+
+
+def advance(delay: float) -> Optional[_Wait]:
     """
     Pauses the current process for the given delay (in simulated time). The process will be resumed when the simulation
     has advanced to the moment corresponding to `now() + delay`.
@@ -567,13 +1544,31 @@ def advance(delay: float) -> None:
     if _logger is not None:
         _log(INFO, "Process", local.name, "advance", delay=delay)
     curr = Process.current()
-    rsim = curr.rsim
-    id_wakeup = rsim()._schedule(delay, curr.switch)  # type: ignore
+    if isinstance(curr, GeneratorProcess):
+        return _advancing(delay)
+    if cast(Simulator, _current_sim)._advance_in_place(delay):
+        return None
+    id_wakeup = cast(Simulator, _current_sim)._schedule(delay, curr.switch)
 
     try:
-        rsim()._gr.switch()                   # type: ignore
+        _wait(cast(Process, curr))
     except Interrupt:
-        rsim()._cancel(id_wakeup)             # type: ignore
+        cast(Simulator, _current_sim)._cancel(id_wakeup)
+        raise
+    return None
+
+
+@_coroutine
+def _advancing(delay: float) -> _Wait:
+    sim = cast(Simulator, _current_sim)
+    if sim._advance_in_place(delay):
+        return
+    id_wakeup = sim._schedule(delay, cast(GeneratorProcess, _current).switch)
+    del sim  # Not to be held on while waiting.
+    try:
+        yield
+    except Interrupt:
+        cast(Simulator, _current_sim)._cancel(id_wakeup)
         raise
 
 
@@ -581,26 +1576,29 @@ def now() -> float:
     """
     Returns current simulated time to the running process.
     """
-    return Process.current().rsim().now()  # type: ignore
+    sim = _current_sim
+    if sim is None:
+        raise TypeError("Current greenlet does not correspond to a Process instance.")
+    return sim.now()
 
 
-def add(proc: Callable, *args: Any, **kwargs: Any) -> Process:
-    return Process.current().rsim().add(proc, *args, **kwargs)  # type: ignore
+def add(proc: Callable, *args: Any, **kwargs: Any) -> BaseProcess:
+    return Simulator.current().add(proc, *args, **kwargs)
 
 
-def add_in(delay: float, proc: Callable, *args: Any, **kwargs: Any) -> Process:
-    return Process.current().rsim().add_in(delay, proc, *args, **kwargs)  # type: ignore
+def add_in(delay: float, proc: Callable, *args: Any, **kwargs: Any) -> BaseProcess:
+    return Simulator.current().add_in(delay, proc, *args, **kwargs)
 
 
-def add_at(moment: float, proc: Callable, *args: Any, **kwargs: Any) -> Process:
-    return Process.current().rsim().add_at(moment, proc, *args, **kwargs)  # type: ignore
+def add_at(moment: float, proc: Callable, *args: Any, **kwargs: Any) -> BaseProcess:
+    return Simulator.current().add_at(moment, proc, *args, **kwargs)
 
 
 def stop() -> None:
     """
     Stops the ongoing simulation, from a process.
     """
-    Process.current().rsim().stop()  # type: ignore
+    Simulator.current().stop()
 
 
 def happens(intervals: Iterable[float], name: Optional[str] = None) -> Callable:
@@ -644,8 +1642,20 @@ def tagged(*tags: Tags) -> Callable:
     These labels are applied to any child Processes produced by event
     """
     def hook(event: Callable):
-        def wrapper(*args, **kwargs):
-            event(*args, **kwargs)
+        # Generator and coroutine bodies are wrapped in kind, so that they still run as generator processes.
+        wrapper: Callable
+        if isgeneratorfunction(event):
+            def wrapper_generator(*args, **kwargs):
+                return (yield from event(*args, **kwargs))
+            wrapper = wrapper_generator
+        elif iscoroutinefunction(event):
+            async def wrapper_coroutine(*args, **kwargs):
+                return await event(*args, **kwargs)
+            wrapper = wrapper_coroutine
+        else:
+            def wrapper_function(*args, **kwargs):
+                event(*args, **kwargs)
+            wrapper = wrapper_function
         setattr(wrapper, GREENSIM_TAG_ATTRIBUTE, tags)
         return wrapper
     return hook
@@ -668,39 +1678,195 @@ class Queue(Named):
     The queue discipline is implemented through a function that yields an order token for each process: the lower the
     token, the closer the process to the top of the queue. Each process joining the queue is given an monotonic counter
     value, which indicates chronological order -- this counter is passed to the function that computes order tokens for
-    the queue. By default, the queue discipline is chronological order (the function trivially returns the counter value
-    as order token). Alternative disciplines, such as priority order and so on, may be implemented by mixing the
-    chronological counter passed to this function with data obtained or computed from the running process. The order
-    token of a joining process is computed only once, before the process is paused.
+    the queue. By default, the queue discipline is chronological order (first in, first out): the queue then does
+    without order tokens, and keeps processes in plain arrival order, so that joining and popping take constant time.
+    Alternative disciplines, such as priority order and so on, may be implemented by mixing the chronological counter
+    passed to this function with data obtained or computed from the running process. The order token of a joining
+    process is computed only once, before the process is paused, unless the queue is asked to `reprioritize()` the
+    process. Processes with equal order tokens leave the queue in chronological order.
+
+    Processes that leave the queue without being popped (because they are interrupted, or time out) are only marked off
+    from it, and skipped once they come up, so that their departure takes constant time. Once they make up most of
+    the queue, it is rebuilt without them.
+
+    Parameter `fifo` may be set to True to make it explicit that the queue is first in, first out; no order token
+    function may then be given.
     """
 
     GetOrderToken = Callable[[int], int]
 
-    def __init__(self, get_order_token: Optional[GetOrderToken] = None, name: Optional[str] = None) -> None:
+    NUM_LEFT_COMPACTION_MIN = 64
+
+    def __init__(
+        self,
+        get_order_token: Optional[GetOrderToken] = None,
+        name: Optional[str] = None,
+        fifo: bool = False
+    ) -> None:
         super().__init__(name)
-        self._waiting: List[Tuple[int, Process]] = []
-        self._counter = 0
+        if fifo and get_order_token is not None:
+            raise ValueError("A first in, first out queue cannot be given an order token function.")
+        # Entries are [order token, counter, process, data, timeout] lists, where data is what the owner of the queue
+        # needs to know of the waiting process, and timeout identifies the event timing out its wait, if any; the
+        # process of an entry is set to None once it has left the queue. Entries are kept in a heap, or in arrival order
+        # for a first in, first out queue. The top entry is always that of a process still in the queue.
+        self._fifo = get_order_token is None
+        self._waiting: Union[List[List[Any]], Deque[List[Any]]] = deque() if self._fifo else []
+        self._entries: Dict[BaseProcess, List[Any]] = {}
+        self._counter: Iterator[int] = count(1)
         self._get_order_token = get_order_token or (lambda counter: counter)
+        self._owner: Optional[Callable[[], Optional[Named]]] = None
+
+    @staticmethod
+    def _owned_by(
+        owner: Named,
+        get_order_token: Optional["Queue.GetOrderToken"],
+        counter: Optional[Iterator[int]] = None
+    ) -> "Queue":
+        """
+        Builds the queue of processes waiting on another object, which it is named after. Queues sharing the given
+        chronological counter order their processes consistently with one another.
+        """
+        queue = Queue(get_order_token)
+        queue._owner = weakref.ref(owner)
+        if counter is not None:
+            queue._counter = counter
+        return queue
+
+    def _default_name(self) -> str:
+        owner = self._owner and self._owner()
+        if owner is not None:
+            return owner.name + "-queue"
+        return super()._default_name()
 
     def is_empty(self) -> bool:
         """
         Returns whether the queue is empty.
         """
-        return len(self) == 0
+        return not self._entries
 
     def __len__(self) -> int:
         """
         Queue length.
         """
-        return len(self._waiting)
+        return len(self._entries)
 
-    def peek(self) -> Process:
+    def peek(self) -> BaseProcess:
         """
         Returns the process instance at the top of the queue. This is useful mostly for querying purposes: the
         `resume()` method of the returned process should *not* be called by the caller, as `peek()` does not remove the
         process from the queue.
         """
-        return self._waiting[0][1]
+        return self._waiting[0][2]
+
+    def _peek_entry(self) -> List[Any]:
+        """
+        Returns the entry of the process at the top of the queue, with the data it joined the queue with.
+        """
+        return self._waiting[0]
+
+    def _enter(self, process: BaseProcess, data: Any = None, id_timeout: Optional[int] = None) -> None:
+        """
+        Puts the given process, which is the current one, in the queue, along with the given data and the identifier of
+        the event timing out its wait.
+        """
+        counter = next(self._counter)
+        if _logger is not None:
+            self._log(INFO, "join")
+        self._push([counter if self._fifo else self._get_order_token(counter), counter, process, data, id_timeout])
+
+    def _push(self, entry: List[Any]) -> None:
+        self._entries[entry[2]] = entry
+        if self._fifo:
+            self._waiting.append(entry)
+        else:
+            heappush(cast(List[List[Any]], self._waiting), entry)
+
+    def _discard(self, process: BaseProcess) -> bool:
+        """
+        Marks the given process off the queue. Returns whether it was in the queue.
+        """
+        entry = self._entries.pop(process, None)
+        if entry is None:
+            return False
+        entry[2] = None
+        waiting = self._waiting
+        if len(waiting) >= Queue.NUM_LEFT_COMPACTION_MIN and len(waiting) > 2 * len(self._entries):
+            if self._fifo:
+                self._waiting = deque(other for other in waiting if other[2] is not None)
+            else:
+                self._waiting = [other for other in waiting if other[2] is not None]
+                heapify(self._waiting)
+        elif self._fifo:
+            waiting = cast(Deque[List[Any]], waiting)
+            while waiting and waiting[0][2] is None:
+                waiting.popleft()
+        else:
+            waiting = cast(List[List[Any]], waiting)
+            while waiting and waiting[0][2] is None:
+                heappop(waiting)
+        return True
+
+    def _serve(self, process: BaseProcess) -> None:
+        """
+        Takes the given process out of the queue as it gets served, cancelling the event timing out its wait: were it
+        due at the same moment, the process would time out while it is being resumed.
+        """
+        id_timeout = self._entries[process][4]
+        self._discard(process)
+        Queue._cancel_timeout(process, id_timeout)
+
+    @staticmethod
+    def _cancel_timeout(process: BaseProcess, id_timeout: Optional[int]) -> None:
+        """
+        Cancels the event timing out the wait of a process leaving a queue, if it waits with a timeout.
+        """
+        if id_timeout is not None:
+            sim = process.rsim()
+            if sim is not None:
+                sim._cancel(id_timeout)
+
+    @staticmethod
+    def _withdraw(process: BaseProcess) -> None:
+        """
+        Takes a process just popped out of a queue out of the other queues it waits in, as it selects among multiple
+        signals, so that it is not resumed again.
+        """
+        queues = process._queues_selected
+        if queues:
+            process._queues_selected = ()
+            for queue in queues:
+                queue._discard(process)
+
+    def reprioritize(self, process: BaseProcess) -> None:
+        """
+        Computes again the order token of a process waiting in the queue, and moves the process in the queue
+        accordingly. This serves queue disciplines whose priorities change while processes wait. The order token is
+        computed from the chronological counter the process joined the queue with, as if this process were running, so
+        that the function computing tokens may keep obtaining data from the current process. Raises
+        :py:class:`ValueError` if the process is not in the queue.
+        """
+        global _current, _current_sim
+        entry = self._entries.get(process)
+        if entry is None:
+            raise ValueError(f"Process {process.local.name} is not waiting in queue {self.name}.")
+        if self._fifo:
+            return
+        counter = entry[1]
+        current = _current
+        current_sim = _current_sim
+        _current = process
+        _current_sim = process.rsim()
+        try:
+            token = self._get_order_token(counter)
+        finally:
+            _current = current
+            _current_sim = current_sim
+        if _logger is not None:
+            self._log(INFO, "reprioritize", process=process.local.name)
+        if token != entry[0]:
+            self._discard(process)
+            self._push([token, counter, process, entry[3], entry[4]])
 
     def join(self, timeout: Optional[float] = None):
         """
@@ -712,53 +1878,30 @@ class Queue(Named):
             If this parameter is not ``None``, it is taken as a delay at the end of which the process times out, and
             leaves the queue forcibly. In such a situation, a :py:class:`Timeout` exception is raised on the process.
         """
-        class CancelBalk(Interrupt):
-            pass
+        return _waitable(self._joining(timeout))
 
-        self._counter += 1
-        if _logger is not None:
-            self._log(INFO, "join")
-        heappush(self._waiting, (self._get_order_token(self._counter), Process.current()))
+    @_coroutine
+    def _joining(self, timeout: Optional[float], data: Any = None) -> _Wait:
+        current = Process.current()
 
-        proc_balk = None
+        # The timeout is an event raising the exception on the process directly, which gets cancelled should the
+        # process leave the queue otherwise: as it gets served, or interrupted.
+        id_timeout = None
         if timeout is not None:
-            def balk(proc):
-                nonlocal proc_balk
-                try:
-                    advance(cast(float, timeout))
-                    proc.interrupt(Timeout())
-                except CancelBalk:
-                    pass
-                finally:
-                    proc_balk = None
-
-            # The balking process is started here.
-            proc_balk = add(balk, Process.current())
+            id_timeout = cast(Simulator, _current_sim)._schedule(timeout, current.throw, Timeout())
 
         try:
-            pause()
+            self._enter(current, data, id_timeout)
+            del current  # Not to be held on while waiting.
+            yield from _pausing()
         except Interrupt:
-            current = Process.current()
-            for index in reversed([i for i, (_, proc) in enumerate(self._waiting) if proc is current]):
-                del self._waiting[index]
-            heapify(self._waiting)
+            self._discard(Process.current())
             raise
         finally:
-            # Three situations can prompt a process to exit a queue:
-            #
-            # 1. The process is pop()ped out of the queue by a peer.
-            # 2. The process balk()s out after a timeout.
-            # 3. The process leaves the queue because of a distinct interrupt (besides CancelBalk).
-            #
-            # In cases 1 and 3, the balking process has never exited and is still in the advance() call. In both these
-            # cases, the balking process should itself be interrupted, otherwise it may prompt the balking of a future
-            # queue traversal. However, if we exit the queue because of case no. 2, the balking process is finished.
-            # Interrupting it would do no harm (it has been tested by accident), but we mean to be deliberate about when
-            # this interruption is necessary. So we perform the interrupt of the balking process only in cases 1 and 3;
-            # in case 2, the balk() function exits, thereby clearing the reference we have here to it. Do remark that
-            # whenever a timeout is not set, proc_balk remains None all the way, reducing the situation to case 1.
-            if proc_balk is not None:
-                proc_balk.interrupt(CancelBalk())
+            sim = _current_sim
+            if id_timeout is not None and sim is not None:
+                sim._cancel(id_timeout)
+            del sim
 
     def pop(self):
         """
@@ -766,11 +1909,45 @@ class Queue(Named):
         This method may be invoked from anywhere (its use is not confined to processes, as method `join()` is).
         """
         if not self.is_empty():
-            _, process = heappop(self._waiting)
+            process = self.peek()
+            self._serve(process)
+            Queue._withdraw(process)
             if _logger is not None:
                 self._log(INFO, "pop", process=process.local.name)
             process.resume()
 
+    def _pop_all(self, test: Optional[Callable[[BaseProcess], bool]] = None) -> List[BaseProcess]:
+        """
+        Takes all processes out of the queue at once, or only those passing the given test, and returns them in queue
+        order. They are not resumed.
+        """
+        if test is None:
+            waiting = self._waiting if self._fifo else sorted(self._waiting)
+            entries = [entry for entry in waiting if entry[2] is not None]
+            self._waiting = deque() if self._fifo else []
+            self._entries = {}
+        else:
+            entries = sorted(entry for entry in self._entries.values() if test(entry[2]))
+        processes = [entry[2] for entry in entries]
+        for process, entry in zip(processes, entries):
+            if test is not None:
+                self._discard(process)
+            Queue._cancel_timeout(process, entry[4])
+            Queue._withdraw(process)
+        return processes
+
+    def _resume_all(self, processes: List[BaseProcess]) -> None:
+        """
+        Resumes processes popped out of the queue, in the given order, through a single event.
+        """
+        if processes:
+            if _logger is not None:
+                for process in processes:
+                    self._log(INFO, "pop", process=process.local.name)
+                    _log(INFO, "Process", process.local.name, "resume")
+            sim = processes[0].rsim()
+            sim._schedule(0.0, sim._resume_all, processes)  # type: ignore
+
 
 class Signal(Named):
     """
@@ -782,7 +1959,7 @@ class Signal(Named):
     def __init__(self, get_order_token: Optional[Queue.GetOrderToken] = None, name: Optional[str] = None) -> None:
         super().__init__(name)
         self._is_on = True
-        self._queue = Queue(get_order_token, name=self.name + "-queue")
+        self._queue = Queue._owned_by(self, get_order_token)
 
     @property
     def is_on(self) -> bool:
@@ -799,12 +1976,14 @@ class Signal(Named):
         sequence corresponding to the queue discipline. Therefore, if one of the resumed processes turns the signal back
         off, remaining resumed processes join back the queue. If the queue discipline is not monotonic (for instance,
         if it bears a random component), then this toggling of the signal may reorder the processes.
+
+        The waiting processes are all resumed through a single event, however many they are.
         """
         if _logger is not None:
             self._log(INFO, "turn-on")
         self._is_on = True
-        while not self._queue.is_empty():
-            self._queue.pop()
+        if not self._queue.is_empty():
+            self._queue._resume_all(self._queue._pop_all())
         return self
 
     def turn_off(self) -> "Signal":
@@ -816,7 +1995,7 @@ class Signal(Named):
         self._is_on = False
         return self
 
-    def wait(self, timeout: Optional[float] = None) -> None:
+    def wait(self, timeout: Optional[float] = None) -> Optional[_Wait]:
         """
         Makes the current process wait for the signal. If it is closed, it will join the signal's queue.
 
@@ -825,10 +2004,14 @@ class Signal(Named):
             stops waiting for the :py:class:`Signal`. In such a situation, a :py:class:`Timeout` exception is raised on
             the process.
         """
+        return _waitable(self._waiting_on(timeout))
+
+    @_coroutine
+    def _waiting_on(self, timeout: Optional[float]) -> _Wait:
         if _logger is not None:
             self._log(INFO, "wait")
         while not self.is_on:
-            self._queue.join(timeout)
+            yield from self._queue._joining(timeout)
 
 
 def select(*signals: Signal, **kwargs) -> List[Signal]:
@@ -841,36 +2024,159 @@ def select(*signals: Signal, **kwargs) -> List[Signal]:
         stops waiting on the set of :py:class:`Signal`s. In such a situation, a :py:class:`Timeout` exception is raised
         on the process.
     """
-    class CleanUp(Interrupt):
-        pass
-
     timeout = kwargs.get("timeout", None)
     if not isinstance(timeout, (float, int, type(None))):
         raise ValueError("The timeout keyword parameter can be either None or a number.")
+    return _waitable(_selecting(signals, timeout))
 
-    def wait_one(signal: Signal, common: Signal) -> None:
-        try:
-            signal.wait()
-            common.turn_on()
-        except CleanUp:
-            pass
-
-    # We simply sets up multiple sub-processes respectively waiting for one of the signals. Once one of them has fired,
-    # the others will all run no-op eventually, so no need for any explicit clean-up.
-    common = Signal(name=local.name + "-selector").turn_off()
+
+@_coroutine
+def _selecting(signals: Sequence[Signal], timeout: Optional[float]) -> _Wait:
     if _logger is not None:
         _log(INFO, "select", "select", "select", signals=[sig.name for sig in signals])
-    procs = []
-    for signal in signals:
-        procs.append(add(wait_one, signal, common))
+    signals_on = [signal for signal in signals if signal.is_on]
+    if signals_on:
+        return signals_on
+
+    # The process waits in the queues of all signals at once. The first of these queues to pop it takes it out of the
+    # others, so that it gets resumed only once.
+    # The timeout event is cancelled by the queue popping the process: should none of the signals be on by the time the
+    # process resumes, it waits again until the moment it was to time out.
+    queues = tuple(dict.fromkeys(signal._queue for signal in signals))
+    moment_timeout = None if timeout is None else cast(Simulator, _current_sim).now() + timeout
+    id_timeout = None
 
     try:
-        common.wait(timeout)
+        while not signals_on:
+            current = Process.current()
+            if moment_timeout is not None:
+                id_timeout = cast(Simulator, _current_sim)._schedule_at(moment_timeout, current.throw, Timeout())
+            for queue in queues:
+                queue._enter(current, None, id_timeout)
+            current._queues_selected = queues
+            del current  # Not to be held on while waiting.
+            yield from _pausing()
+            signals_on = [signal for signal in signals if signal.is_on]
     finally:
-        for proc in procs:  # Clean up the support processes.
-            proc.interrupt(CleanUp())
+        # Without a current process, the process is being garbage-collected, so no queue refers to it anymore.
+        process = _current
+        if process is not None:
+            process._queues_selected = ()
+            for queue in queues:
+                queue._discard(process)
+        del process
+        sim = _current_sim
+        if id_timeout is not None and sim is not None:
+            sim._cancel(id_timeout)
+        del sim
+
+    return signals_on
+
+
+class Condition(Named):
+    """
+    `Condition` instances let processes wait until the state of the simulation allows them to proceed, without all
+    waking up whenever this state changes. A process waits on the condition under a *key*, which stands for the change
+    it expects, and possibly with a *predicate*, a function without parameters telling whether it may proceed. Code
+    changing the state of the simulation then invokes `notify()` with the key of this change: only the processes waiting
+    under this key, and whose predicate holds, are resumed. Other waiting processes are neither resumed nor run, so
+    that the cost of a notification scales with the processes that proceed, rather than with all those waiting.
+
+    Processes waiting under a same key are resumed in the order of the queue discipline given by `get_order_token` (see
+    :py:class:`Queue`); by default, in the order they started waiting.
+    """
+
+    def __init__(self, get_order_token: Optional[Queue.GetOrderToken] = None, name: Optional[str] = None) -> None:
+        super().__init__(name)
+        self._get_order_token = get_order_token
+        self._queues: Dict[Hashable, Queue] = {}
+        self._predicates: Dict[BaseProcess, Callable[[], bool]] = {}
+
+    def num_waiting(self, key: Hashable = None) -> int:
+        """
+        Returns the number of processes waiting on the condition under the given key.
+        """
+        queue = self._queues.get(key)
+        return 0 if queue is None else len(queue)
+
+    def wait(
+        self,
+        key: Hashable = None,
+        predicate: Optional[Callable[[], bool]] = None,
+        timeout: Optional[float] = None
+    ) -> Optional[_Wait]:
+        """
+        Makes the current process wait on the condition under the given key, until it is notified under this key. If a
+        predicate is given, the process only waits if it does not already hold, and is only resumed by a notification
+        once it holds. Remark that the predicate is evaluated by the notifying code, and should thus only depend on the
+        state of the simulation, not on that of the current process.
+
+        :param timeout:
+            If this parameter is not ``None``, it is taken as a delay at the end of which the process times out, and
+            stops waiting on the :py:class:`Condition`. In such a situation, a :py:class:`Timeout` exception is raised
+            on the process.
+        """
+        return _waitable(self._waiting_on(key, predicate, timeout))
+
+    @_coroutine
+    def _waiting_on(self, key: Hashable, predicate: Optional[Callable[[], bool]], timeout: Optional[float]) -> _Wait:
+        if _logger is not None:
+            self._log(INFO, "wait", key=key)
+        if predicate is not None and predicate():
+            return
+
+        if predicate is not None:
+            self._predicates[Process.current()] = predicate
+        moment_timeout = None if timeout is None else cast(Simulator, _current_sim).now() + timeout
+
+        queue: Optional[Queue] = None
+        try:
+            # The state of the simulation may have changed again between notification and resumption. The process then
+            # waits again until the moment it was to time out.
+            while True:
+                queue = self._queues.get(key)
+                if queue is None:
+                    queue = self._queues[key] = Queue._owned_by(self, self._get_order_token)
+                if moment_timeout is None:
+                    yield from queue._joining(None)
+                else:
+                    yield from queue._joining(moment_timeout - cast(Simulator, _current_sim).now())
+                if predicate is None or predicate():
+                    break
+        finally:
+            # Without a current process, the process is being garbage-collected, along with what still refers to it.
+            current = _current
+            if current is not None:
+                self._predicates.pop(current, None)
+            del current
+            if queue is not None and queue.is_empty() and self._queues.get(key) is queue:
+                del self._queues[key]
+
+    def _may_proceed(self, process: BaseProcess) -> bool:
+        predicate = self._predicates.get(process)
+        return predicate is None or predicate()
+
+    def notify(self, key: Hashable = None) -> "Condition":
+        """
+        Resumes the processes waiting on the condition under the given key, whose predicate holds. This may be invoked
+        from any code.
+        """
+        if _logger is not None:
+            self._log(INFO, "notify", key=key)
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue._resume_all(queue._pop_all(self._may_proceed if self._predicates else None))
+        return self
 
-    return [signal for signal in signals if signal.is_on]
+    def notify_all(self) -> "Condition":
+        """
+        Resumes the processes waiting on the condition whose predicate holds, whichever their key.
+        """
+        if _logger is not None:
+            self._log(INFO, "notify-all")
+        for queue in list(self._queues.values()):
+            queue._resume_all(queue._pop_all(self._may_proceed if self._predicates else None))
+        return self
 
 
 class Resource(Named):
@@ -879,8 +2185,14 @@ class Resource(Named):
     access. A resource is built with a number of available *instances*, and any process can `take()` a certain number of
     these instances; it must then `release()` these instances afterwards. If the requested number of available instances
     is available, `take()` returns instantly. Otherwise, the process is made to join a queue. When another process
-    releases the instances it has previously taken, if the number of available instances becomes sufficient to satisfy
-    the request of the process at the top of the queue, this top process is popped off and resumed.
+    releases the instances it has previously taken, the processes at the top of the queue whose requests the available
+    instances become sufficient to satisfy are popped off and resumed, holding the instances they requested.
+
+    By default, a process at the top of the queue requesting more instances than are available blocks the processes
+    behind it, even though they may request fewer instances. Parameter `backfill` may rather be set to True, so that the
+    available instances go to the first processes in queue order whose request they satisfy (first fit). This keeps
+    instances from idling, at the risk of making processes with large requests wait indefinitely while smaller
+    requests keep being satisfied.
 
     Remark that concurrent processes can deadlock if they do not `take()` resource instances properly. Consider a set of
     resources `{R1, R2 ... Rn}` that processes from set `{P1, P2, ... Pm}` want to take. Irrespective of process order,
@@ -892,12 +2204,25 @@ class Resource(Named):
         self,
         num_instances: int = 1,
         get_order_token: Optional[Queue.GetOrderToken] = None,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        backfill: bool = False
     ) -> None:
         super().__init__(name)
+        self._num_instances_total = num_instances
         self._num_instances_free = num_instances
-        self._waiting = Queue(get_order_token, name=self.name + "-queue")
-        self._usage: Dict[Process, int] = {}
+        # Processes waiting in the queue joined it with the number of instances they request.
+        self._waiting = Queue._owned_by(self, get_order_token)
+        # When backfilling, waiting processes are rather queued apart by the number of instances they request, so that
+        # the requests the free instances satisfy are found by size instead of through the whole queue. These queues
+        # share the chronological counter of the main queue, so that their tops compare in queue order. Empty queues
+        # are dropped.
+        self._backfill = backfill
+        self._get_order_token = get_order_token
+        self._waiting_by_size: Dict[int, Queue] = {}
+        self._sizes_waiting: List[int] = []  # Sorted.
+        self._usage: Dict[BaseProcess, int] = {}
+        # Instances reserved for processes popped off the queue, which they take once they are resumed.
+        self._granted: Dict[BaseProcess, int] = {}
 
     @property
     def num_instances_free(self) -> int:
@@ -907,9 +2232,9 @@ class Resource(Named):
     @property
     def num_instances_total(self) -> int:
         """Returns the total number of instances of this resource."""
-        return self.num_instances_free + sum(self._usage.values())
+        return self._num_instances_total
 
-    def take(self, num_instances: int = 1, timeout: Optional[float] = None) -> None:
+    def take(self, num_instances: int = 1, timeout: Optional[float] = None) -> Optional[_Wait]:
         """
         The current process reserves a certain number of instances. If there are not enough instances available, the
         process is made to join a queue. When this method returns, the process holds the instances it has requested to
@@ -924,20 +2249,41 @@ class Resource(Named):
 
         if num_instances < 1:
             raise ValueError(f"Process must request at least 1 instance; here requested {num_instances}.")
-        if num_instances > self.num_instances_total:
+        if num_instances > self._num_instances_total:
             raise ValueError(
-                f"Process must request at most {self.num_instances_total} instances; here requested {num_instances}."
+                f"Process must request at most {self._num_instances_total} instances; here requested {num_instances}."
             )
+        return _waitable(self._taking(num_instances, timeout))
+
+    @_coroutine
+    def _taking(self, num_instances: int, timeout: Optional[float]) -> _Wait:
         if _logger is not None:
             self._log(INFO, "take", num_instances=num_instances, free=self.num_instances_free)
-        proc = Process.current()
-        if self._num_instances_free < num_instances:
-            proc.local.__num_instances_required = num_instances
+        moment_timeout = None if timeout is None else cast(Simulator, _current_sim).now() + timeout
+        while self._num_instances_free < num_instances:
+            queue = self._queue_for(num_instances)
             try:
-                self._waiting.join(timeout)
-            finally:
-                del proc.local.__num_instances_required
-        self._num_instances_free -= num_instances
+                if moment_timeout is None:
+                    yield from queue._joining(None, num_instances)
+                else:
+                    yield from queue._joining(moment_timeout - cast(Simulator, _current_sim).now(), num_instances)
+            except Interrupt:
+                self._drop_if_empty(num_instances)
+                # The instances may have been reserved for the process as it was interrupted. Otherwise, its departure
+                # may still unblock the processes queued behind it.
+                if self._granted.pop(Process.current(), 0) > 0:
+                    self._num_instances_free += num_instances
+                self._grant()
+                raise
+            if self._granted.pop(Process.current(), None) is not None:
+                break
+            # Resumed without being granted instances: the process waits again, until the moment it was to time out.
+            queue._discard(Process.current())
+            self._drop_if_empty(num_instances)
+            self._grant()
+        else:
+            self._num_instances_free -= num_instances
+        proc = Process.current()
         if _logger is not None and proc in self._usage:
             self._log(WARNING, "take-again", already=self._usage[proc], more=num_instances)
         self._usage.setdefault(proc, 0)
@@ -968,19 +2314,84 @@ class Resource(Named):
                 )
             if self._usage[proc] <= 0:
                 del self._usage[proc]
-            if not self._waiting.is_empty():
-                num_instances_next = cast(int, self._waiting.peek().local.__num_instances_required)
-                if num_instances_next <= self.num_instances_free:
-                    self._waiting.pop()
-                elif _logger is not None:
-                    self._log(DEBUG, "release-nopop", next_requires=num_instances_next, free=self.num_instances_free)
-            elif _logger is not None:
-                self._log(DEBUG, "release-queueempty")
+            self._grant()
         else:
             raise RuntimeError(
                 f"Process {proc.local.name} tries to release {num_instances} instances, but is holding none.)"
             )
 
+    def _queue_for(self, num_instances: int) -> Queue:
+        """
+        Returns the queue a process requesting the given number of instances is to wait in.
+        """
+        if not self._backfill:
+            return self._waiting
+        queue = self._waiting_by_size.get(num_instances)
+        if queue is None:
+            queue = self._waiting_by_size[num_instances] = Queue._owned_by(
+                self,
+                self._get_order_token,
+                self._waiting._counter
+            )
+            insort(self._sizes_waiting, num_instances)
+        return queue
+
+    def _drop_if_empty(self, num_instances: int) -> None:
+        queue = self._waiting_by_size.get(num_instances)
+        if queue is not None and queue.is_empty():
+            del self._waiting_by_size[num_instances]
+            self._sizes_waiting.remove(num_instances)
+
+    def _queue_next(self) -> Optional[Queue]:
+        """
+        Returns the queue whose top process is to get the instances it requests next, provided the free instances
+        satisfy this request. When backfilling, this is the process first in queue order among those whose request
+        fits.
+        """
+        if not self._backfill:
+            if self._waiting.is_empty() or self._waiting._peek_entry()[3] > self._num_instances_free:
+                return None
+            return self._waiting
+        queue_next = None
+        entry_next = None
+        for size in self._sizes_waiting[:bisect_right(self._sizes_waiting, self._num_instances_free)]:
+            queue = self._waiting_by_size[size]
+            entry = queue._peek_entry()
+            if entry_next is None or entry[:2] < entry_next[:2]:
+                queue_next = queue
+                entry_next = entry
+        return queue_next
+
+    def _grant(self) -> None:
+        """
+        Pops off the queue all processes at its top whose requests the free instances satisfy, or all processes whose
+        requests they satisfy when backfilling, reserving these instances for them, and resumes them.
+        """
+        if self._waiting.is_empty() and not self._waiting_by_size:
+            if _logger is not None:
+                self._log(DEBUG, "release-queueempty")
+            return
+        processes: List[BaseProcess] = []
+        queue_first = None
+        while True:
+            queue = self._queue_next()
+            if queue is None:
+                break
+            num_instances_next = queue._peek_entry()[3]
+            process = queue.peek()
+            queue._serve(process)
+            self._drop_if_empty(num_instances_next)
+            self._num_instances_free -= num_instances_next
+            self._granted[process] = num_instances_next
+            processes.append(process)
+            if queue_first is None:
+                queue_first = queue
+        if queue_first is None:
+            if _logger is not None:
+                self._log(DEBUG, "release-nopop", free=self.num_instances_free)
+        else:
+            queue_first._resume_all(processes)
+
     @contextmanager
     def using(self, num_instances: int = 1, timeout: Optional[float] = None):
         """
@@ -996,6 +2407,8 @@ class Resource(Named):
             If this parameter is not ``None``, it is taken as a delay at the end of which the process times out, and
             leaves the queue forcibly. In such a situation, a :py:class:`Timeout` exception is raised on the process.
         """
+        if isinstance(_current, GeneratorProcess):
+            raise TypeError("Generator processes cannot use resources as context managers: take() and release() them.")
         self.take(num_instances, timeout)
         yield self
         self.release(num_instances)
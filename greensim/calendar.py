@@ -0,0 +1,421 @@
+"""
+Event calendars: priority structures the :py:class:`~greensim.Simulator` keeps its pending events in.
+
+Each pending event is stored as an *entry*, a tuple whose first two items are the event's timestamp and its unique
+identifier (a monotonic counter). Entries are compared as tuples, so events scheduled for the same moment come out in
+the order they were scheduled. Timestamps are either numbers or positive infinity.
+"""
+
+from abc import ABC, abstractmethod
+from functools import partial
+from heapq import heappush, heappop, heapify, nsmallest
+from itertools import chain
+from math import inf
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+Entry = Tuple[Any, ...]
+
+
+class Calendar(ABC):
+    """
+    Abstract priority structure for pending simulation events. Subclasses must yield entries in increasing order of
+    (timestamp, identifier), given that no entry is ever pushed with a timestamp smaller than that of the last entry
+    popped.
+
+    A calendar instance is meant to serve a single :py:class:`~greensim.Simulator`.
+    """
+
+    @abstractmethod
+    def push(self, entry: Entry) -> None:
+        """
+        Adds an entry to the calendar.
+        """
+        pass
+
+    def push_many(self, entries: Iterable[Entry]) -> None:
+        """
+        Adds multiple entries to the calendar.
+        """
+        for entry in entries:
+            self.push(entry)
+
+    @abstractmethod
+    def pop(self) -> Entry:
+        """
+        Removes and returns the earliest entry of the calendar. Raises :py:class:`IndexError` if it is empty.
+        """
+        pass
+
+    @abstractmethod
+    def peek(self) -> Entry:
+        """
+        Returns the earliest entry of the calendar, without removing it. Raises :py:class:`IndexError` if it is empty.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Removes all entries from the calendar.
+        """
+        pass
+
+    def discard(self, should_discard: Callable[[Entry], bool]) -> None:
+        """
+        Removes from the calendar all entries for which the given predicate is true, and rebuilds it with the others.
+        """
+        kept = [entry for entry in self if not should_discard(entry)]
+        self.clear()
+        self.push_many(kept)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Entry]:
+        """
+        Iterates over the entries of the calendar, in no particular order.
+        """
+        pass
+
+
+class HeapCalendar(Calendar):
+    """
+    Binary heap, as maintained by the :py:mod:`heapq` module: O(log n) push and pop. This is the default calendar.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._heap: List[Entry] = []
+        # Bypass method dispatch: these run for every single event of the simulation.
+        self.push = partial(heappush, self._heap)  # type: ignore
+        self.pop = partial(heappop, self._heap)    # type: ignore
+
+    def push(self, entry: Entry) -> None:
+        heappush(self._heap, entry)
+
+    def pop(self) -> Entry:
+        return heappop(self._heap)
+
+    def push_many(self, entries: Iterable[Entry]) -> None:
+        # Rebuilding the heap is linear in its final size, and beats successive pushes once the batch is at least as
+        # large as the heap it is added to.
+        batch = list(entries)
+        if len(batch) >= len(self._heap):
+            self._heap.extend(batch)
+            heapify(self._heap)
+        else:
+            for entry in batch:
+                self.push(entry)
+
+    def peek(self) -> Entry:
+        return self._heap[0]
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def discard(self, should_discard: Callable[[Entry], bool]) -> None:
+        self._heap[:] = [entry for entry in self._heap if not should_discard(entry)]
+        heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter(self._heap)
+
+
+class CalendarQueue(Calendar):
+    """
+    Calendar queue, after R. Brown (1988), *Calendar queues: a fast O(1) priority queue implementation for the
+    simulation event set problem*. Entries are spread over an array of buckets, each spanning a *day* of fixed width;
+    the array wraps around at the end of each *year*. Each bucket is a binary heap, so that entries sharing a timestamp
+    do not degrade push and pop to linear time. The number of buckets follows the number of entries, and the day
+    width is re-estimated from the spacing of the earliest entries whenever the array is resized, so push and pop take
+    amortized constant time for well-behaved timestamp distributions.
+
+    :param num_buckets:
+        Initial number of buckets.
+    :param width:
+        Initial width of a bucket, in simulated time.
+    """
+
+    NUM_SAMPLES_WIDTH = 25
+
+    def __init__(self, num_buckets: int = 2, width: float = 1.0) -> None:
+        super().__init__()
+        if num_buckets < 1:
+            raise ValueError(f"Calendar queue needs at least one bucket; here requested {num_buckets}.")
+        if not width > 0.0:
+            raise ValueError(f"Bucket width must be positive; here requested {width}.")
+        self._num_buckets_min = num_buckets
+        self._buckets: List[List[Entry]] = [[] for _ in range(num_buckets)]
+        self._width = width
+        self._day = 0
+        self._size = 0
+        self._far: List[Entry] = []  # Heap of the entries set at infinity.
+
+    def push(self, entry: Entry) -> None:
+        timestamp = entry[0]
+        if timestamp == inf:
+            heappush(self._far, entry)
+            return
+        day = int(timestamp // self._width)
+        heappush(self._buckets[day % len(self._buckets)], entry)
+        if self._size == 0 or day < self._day:
+            self._day = day
+        self._size += 1
+        if self._size > 2 * len(self._buckets):
+            self._resize(2 * len(self._buckets))
+
+    def _locate(self) -> List[Entry]:
+        """
+        Returns the bucket holding the earliest entry, assuming there is one, and moves the current day up to it.
+        """
+        buckets = self._buckets
+        width = self._width
+        num_buckets = len(buckets)
+        day = self._day
+        for _ in range(num_buckets):
+            bucket = buckets[day % num_buckets]
+            if bucket and bucket[0][0] // width <= day:
+                self._day = day
+                return bucket
+            day += 1
+
+        # No entry within a whole year from the current day: search directly for the earliest one.
+        bucket = min((b for b in buckets if b), key=lambda b: b[0])
+        self._day = int(bucket[0][0] // width)
+        return bucket
+
+    def pop(self) -> Entry:
+        if self._size == 0:
+            if self._far:
+                return heappop(self._far)
+            raise IndexError("pop from an empty calendar")
+        entry = heappop(self._locate())
+        self._size -= 1
+        num_buckets = len(self._buckets)
+        if self._size < num_buckets // 2 and num_buckets > self._num_buckets_min:
+            self._resize(num_buckets // 2)
+        return entry
+
+    def peek(self) -> Entry:
+        if self._size == 0:
+            if self._far:
+                return self._far[0]
+            raise IndexError("peek into an empty calendar")
+        return self._locate()[0]
+
+    def _resize(self, num_buckets: int) -> None:
+        entries = [entry for bucket in self._buckets for entry in bucket]
+        self._width = self._estimate_width(entries) or self._width
+        self._buckets = [[] for _ in range(num_buckets)]
+        for entry in entries:
+            self._buckets[int(entry[0] // self._width) % num_buckets].append(entry)
+        for bucket in self._buckets:
+            heapify(bucket)
+        if entries:
+            self._day = int(min(entries)[0] // self._width)
+
+    def _estimate_width(self, entries: List[Entry]) -> Optional[float]:
+        """
+        Estimates a bucket width from the average separation between the earliest entries, discarding the separations
+        more than twice as large as average (as recommended by Brown). Returns None if no estimate can be made.
+        """
+        earliest = [entry[0] for entry in nsmallest(self.NUM_SAMPLES_WIDTH, entries)]
+        separations = [b - a for a, b in zip(earliest, earliest[1:])]
+        if not separations:
+            return None
+        average = sum(separations) / len(separations)
+        regular = [sep for sep in separations if sep <= 2.0 * average]
+        if regular:
+            average = sum(regular) / len(regular)
+        if not average > 0.0:
+            return None
+        return 3.0 * average
+
+    def clear(self) -> None:
+        for bucket in self._buckets:
+            bucket.clear()
+        self._far.clear()
+        self._size = 0
+        self._day = 0
+
+    def __len__(self) -> int:
+        return self._size + len(self._far)
+
+    def __iter__(self) -> Iterator[Entry]:
+        return chain(chain.from_iterable(self._buckets), self._far)
+
+
+class _Rung:
+    """
+    Rung of a :py:class:`LadderQueue`: array of unsorted buckets spanning consecutive intervals of equal width. Buckets
+    before the current one have already been handed over to lower rungs or to the bottom of the ladder.
+    """
+
+    __slots__ = ("start", "width", "buckets", "current")
+
+    def __init__(self, start: float, width: float, num_buckets: int, entries: List[Entry]) -> None:
+        self.start = start
+        self.width = width
+        self.buckets: List[List[Entry]] = [[] for _ in range(num_buckets)]
+        self.current = 0
+        for entry in entries:
+            self.insert(entry)
+
+    def start_current(self) -> float:
+        return self.start + self.current * self.width
+
+    def insert(self, entry: Entry) -> None:
+        index = int((entry[0] - self.start) // self.width)
+        last = len(self.buckets) - 1
+        if index > last:
+            index = last
+        if index < self.current:
+            index = self.current
+            if index > last:
+                # All buckets have been handed over: the entry comes after everything held by lower rungs.
+                self.buckets.append([])
+        self.buckets[index].append(entry)
+
+    def next_bucket(self) -> Optional[List[Entry]]:
+        """
+        Hands over the next non-empty bucket, or returns None if the rung is exhausted.
+        """
+        while self.current < len(self.buckets):
+            bucket = self.buckets[self.current]
+            self.current += 1
+            if bucket:
+                return bucket
+        return None
+
+    def start_bucket(self, index: int) -> float:
+        return self.start + index * self.width
+
+    def __iter__(self) -> Iterator[Entry]:
+        return chain.from_iterable(self.buckets[self.current:])
+
+
+class LadderQueue(Calendar):
+    """
+    Ladder queue, after W.T. Tang, R.S.M. Goh and I.L.-J. Thng (2005), *Ladder queue: an O(1) priority queue structure
+    for large-scale discrete event simulation*. Entries far in the future are appended to an unsorted *top* list; when
+    it is needed, this list is spread over a *rung* of buckets, and each bucket is either spread further on a finer rung
+    (when it holds more than ``threshold`` entries) or sorted into the *bottom* list, from which entries are popped.
+    Entries are thus only sorted in small batches close to the moment they come out, giving amortized O(1) hold time.
+
+    :param threshold:
+        Largest number of entries sorted at once into the bottom of the ladder.
+    :param max_rungs:
+        Maximum number of rungs of the ladder.
+    """
+
+    def __init__(self, threshold: int = 50, max_rungs: int = 8) -> None:
+        super().__init__()
+        if threshold < 1:
+            raise ValueError(f"Ladder queue threshold must be at least 1; here requested {threshold}.")
+        self._threshold = threshold
+        self._max_rungs = max_rungs
+        self._top: List[Entry] = []
+        self._top_min = inf
+        self._top_max = -inf
+        self._top_start = -inf
+        self._rungs: List[_Rung] = []
+        self._bottom: List[Entry] = []  # Heap
+        self._far: List[Entry] = []  # Heap of the entries set at infinity.
+        self._size = 0
+
+    def push(self, entry: Entry) -> None:
+        self._size += 1
+        timestamp = entry[0]
+        if timestamp >= self._top_start:
+            if timestamp == inf:
+                heappush(self._far, entry)
+            else:
+                self._top.append(entry)
+                if timestamp < self._top_min:
+                    self._top_min = timestamp
+                if timestamp > self._top_max:
+                    self._top_max = timestamp
+            return
+        for rung in self._rungs:
+            if timestamp >= rung.start_current():
+                rung.insert(entry)
+                return
+        heappush(self._bottom, entry)
+
+    def _prepare(self) -> List[Entry]:
+        """
+        Returns the heap that holds the earliest entry, refilling the bottom of the ladder if necessary.
+        """
+        if self._bottom:
+            return self._bottom
+        while True:
+            if not self._rungs:
+                if not self._top:
+                    if self._far:
+                        return self._far
+                    raise IndexError("empty calendar")
+                self._transfer_top()
+                if self._bottom:
+                    return self._bottom
+                continue
+
+            rung = self._rungs[-1]
+            bucket = rung.next_bucket()
+            if bucket is None:
+                self._rungs.pop()
+                continue
+            if len(bucket) > self._threshold and len(self._rungs) < self._max_rungs:
+                lowest = min(entry[0] for entry in bucket)
+                if lowest < max(entry[0] for entry in bucket):
+                    index = rung.current - 1
+                    width = rung.width / len(bucket)
+                    if width > 0.0:
+                        self._rungs.append(_Rung(rung.start_bucket(index), width, len(bucket), bucket))
+                        continue
+            heapify(bucket)
+            self._bottom = bucket
+            return bucket
+
+    def _transfer_top(self) -> None:
+        top = self._top
+        lowest = self._top_min
+        highest = self._top_max
+        self._top = []
+        self._top_min = inf
+        self._top_max = -inf
+        self._top_start = highest
+        if len(top) <= self._threshold or not lowest < highest:
+            heapify(top)
+            self._bottom = top
+        else:
+            self._rungs.append(_Rung(lowest, (highest - lowest) / len(top), len(top) + 1, top))
+
+    def pop(self) -> Entry:
+        entry = heappop(self._prepare())
+        self._size -= 1
+        return entry
+
+    def peek(self) -> Entry:
+        return self._prepare()[0]
+
+    def clear(self) -> None:
+        self._top = []
+        self._top_min = inf
+        self._top_max = -inf
+        self._top_start = -inf
+        self._rungs.clear()
+        self._bottom = []
+        self._far = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Entry]:
+        return chain(self._top, chain.from_iterable(self._rungs), self._bottom, self._far)
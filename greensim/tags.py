@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Iterator, Set
+from typing import Iterable, Iterator, List, Set
 
 
 # This class should remain empty so that it can be subclassed by users
@@ -10,46 +10,81 @@ class Tags(Enum):
     pass
 
 
+# Each tag gets assigned a distinct bit the first time it is used, so that sets of tags can be represented as integer
+# bitmasks. The bit is stored on the tag itself, sparing the hashing of Enum members.
+_ATTRIBUTE_BIT = "_greensim_bit"
+_tags_by_bit: List[Tags] = []
+
+
+def _bit(tag: Tags) -> int:
+    try:
+        return getattr(tag, _ATTRIBUTE_BIT)
+    except AttributeError:
+        bit = 1 << len(_tags_by_bit)
+        setattr(tag, _ATTRIBUTE_BIT, bit)
+        _tags_by_bit.append(tag)
+        return bit
+
+
+def _mask(tags: Iterable[Tags]) -> int:
+    mask = 0
+    for tag in tags:
+        mask |= _bit(tag)
+    return mask
+
+
+def _iter_mask(mask: int) -> Iterator[Tags]:
+    while mask:
+        lowest = mask & -mask
+        yield _tags_by_bit[lowest.bit_length() - 1]
+        mask ^= lowest
+
+
 class TaggedObject:
     """
     Provides standardized methods for managing tags on generic objects
 
     Tags can be created by extending the Tags class, which is an Enum
 
-    Methods on this class are all wrappers around standard Python set() methods
+    The tags of an object are stored as an integer bitmask, so that set operations on tags are integer operations, and
+    tags can be copied from one object to another by mere assignment.
     """
 
-    # Use a set since tags are order-independant and should be unique
-    _tag_set: Set[Tags] = set()
+    # Tags are order-independant and unique: they are kept as a set, encoded as a bitmask.
+    _tags: int = 0
 
     def __init__(self, *tag_set: Tags) -> None:
-        self._tag_set = set(tag_set)
+        self._tags = _mask(tag_set)
+
+    @property
+    def _tag_set(self) -> Set[Tags]:
+        return set(_iter_mask(self._tags))
 
     def iter_tags(self) -> Iterator[Tags]:
-        return iter(self._tag_set)
+        return _iter_mask(self._tags)
 
     def has_tag(self, needle: Tags) -> bool:
         """
-        Applies the "in" operator to search for the argument in the set of tags
+        Tells whether the argument is among the tags of this object
         """
-        return needle in self._tag_set
+        return self._tags & _bit(needle) != 0
 
     def tag_with(self, *new_tags: Tags) -> None:
         """
         Take the union of the current tags and the tags in the argument,
         make the union the new set of tags for this object
         """
-        self._tag_set |= set(new_tags)
+        self._tags |= _mask(new_tags)
 
     def untag(self, *drop_tags: Tags) -> None:
         """
         Take the difference of the current tags and the tags in the argument,
         make the difference the new set of tags for this object
         """
-        self._tag_set -= set(drop_tags)
+        self._tags &= ~_mask(drop_tags)
 
     def clear_tags(self) -> None:
         """
         Remove all tags
         """
-        self._tag_set.clear()
+        self._tags = 0
@@ -0,0 +1,8 @@
+import pytest
+
+from greensim.calendar import HeapCalendar, CalendarQueue, LadderQueue
+
+
+@pytest.fixture(params=[HeapCalendar, CalendarQueue, LadderQueue])
+def calendar_type(request):
+    return request.param
@@ -0,0 +1,154 @@
+from heapq import heappush, heappop
+from math import inf
+from random import Random
+
+import pytest
+
+from greensim import Simulator, advance, now, Queue, Interrupt
+from greensim.calendar import Calendar, HeapCalendar
+
+
+def run_hold_model(calendar, seed, integer):
+    rng = Random(seed)
+    reference = []
+    moment = 0
+    identifier = 0
+    for _ in range(5000):
+        if not reference or rng.random() < 0.55:
+            draw = rng.random()
+            if draw < 0.1:
+                delay = 0
+            elif draw < 0.12:
+                delay = inf
+            elif draw < 0.5:
+                delay = rng.randint(0, 5) if integer else rng.choice([0.5, 1.0, 2.0])
+            else:
+                delay = rng.randint(0, 10000) if integer else rng.expovariate(0.01)
+            entry = (moment + delay, identifier, None)
+            identifier += 1
+            calendar.push(entry)
+            heappush(reference, entry)
+        else:
+            assert calendar.peek() == reference[0]
+            entry = calendar.pop()
+            assert entry == heappop(reference)
+            if entry[0] != inf:
+                moment = entry[0]
+        assert len(calendar) == len(reference)
+    assert sorted(calendar) == sorted(reference)
+    while reference:
+        assert calendar.pop() == heappop(reference)
+    assert len(calendar) == 0
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_calendar_order(calendar_type, seed):
+    run_hold_model(calendar_type(), seed, seed % 2 == 0)
+
+
+def test_calendar_abstract():
+    with pytest.raises(TypeError):
+        Calendar()
+
+
+def test_calendar_empty(calendar_type):
+    calendar = calendar_type()
+    assert len(calendar) == 0
+    with pytest.raises(IndexError):
+        calendar.pop()
+    with pytest.raises(IndexError):
+        calendar.peek()
+
+
+def test_calendar_same_timestamp_fifo(calendar_type):
+    calendar = calendar_type()
+    calendar.push_many((5.0, n, None) for n in range(200))
+    calendar.push((1.0, 200, None))
+    assert [calendar.pop()[1] for _ in range(201)] == [200] + list(range(200))
+
+
+def test_calendar_same_timestamp_many(calendar_type):
+    calendar = calendar_type()
+    for n in range(50000):
+        calendar.push((1.0, n, None))
+    assert [calendar.pop()[1] for _ in range(50000)] == list(range(50000))
+
+
+def test_calendar_push_many(calendar_type):
+    rng = Random(3)
+    calendar = calendar_type()
+    reference = []
+    for batch_size in [10, 1000, 3, 50]:
+        batch = [(rng.random() * 100.0, len(reference) + n, None) for n in range(batch_size)]
+        calendar.push_many(batch)
+        reference.extend(batch)
+        assert len(calendar) == len(reference)
+    assert [calendar.pop() for _ in range(len(reference))] == sorted(reference)
+
+
+def test_calendar_clear(calendar_type):
+    calendar = calendar_type()
+    for n in range(100):
+        calendar.push((float(n % 7), n, None))
+    calendar.pop()
+    calendar.clear()
+    assert len(calendar) == 0
+    assert list(calendar) == []
+    calendar.push((3.0, 100, None))
+    assert calendar.pop() == (3.0, 100, None)
+
+
+def test_calendar_discard(calendar_type):
+    calendar = calendar_type()
+    for n in range(500):
+        calendar.push((float(n % 13), n, None))
+    for _ in range(50):
+        calendar.pop()
+    calendar.discard(lambda entry: entry[1] % 3 == 0)
+    remaining = sorted(entry for entry in calendar)
+    assert all(entry[1] % 3 != 0 for entry in remaining)
+    assert len(calendar) == len(remaining)
+    assert [calendar.pop() for _ in range(len(remaining))] == remaining
+
+
+def test_simulator_same_time_fifo(calendar_type):
+    log = []
+
+    def proc(n):
+        advance(n % 3)
+        log.append((now(), n))
+
+    sim = Simulator(scheduler=calendar_type())
+    for n in range(30):
+        sim.add(proc, n)
+    sim.run()
+    assert log == sorted(log)
+
+
+def run_impatient(calendar):
+    queue = Queue()
+    log = []
+
+    def impatient(n):
+        try:
+            queue.join(timeout=float(n))
+            log.append((now(), n, "served"))
+        except Interrupt:
+            log.append((now(), n, "balk"))
+
+    def server():
+        while True:
+            advance(2.5)
+            queue.pop()
+
+    sim = Simulator(scheduler=calendar)
+    for n in range(1, 20):
+        sim.add(impatient, n)
+    sim.add(server)
+    sim.run(100.0)
+    assert sim.now() == pytest.approx(100.0)
+    return log
+
+
+def test_simulator_timeouts_interrupts(calendar_type):
+    assert run_impatient(calendar_type()) == run_impatient(HeapCalendar())
@@ -1,13 +1,17 @@
 import gc
+import os
+import subprocess
+import sys
 from itertools import repeat
-import re
-from typing import List, Callable
+from typing import List, Callable, Optional
 
 import greenlet
 import pytest
 
 from greensim import GREENSIM_TAG_ATTRIBUTE, Simulator, Process, Named, now, advance, pause, add, happens, local, \
-    Queue, Signal, select, Resource, add_in, add_at, tagged, Interrupt, _Event, Timeout
+    Queue, Signal, select, Resource, add_in, add_at, tagged, Interrupt, _Event, Timeout, GeneratorProcess, Condition, \
+    BaseProcess
+from greensim.calendar import Calendar
 from greensim.tags import Tags
 
 
@@ -19,17 +23,38 @@ class TestTag(Tags):
 
 
 def test_event_order():
-    assert _Event(1.0, 89, lambda: None) < _Event(1.1, 1, lambda: None)
-    assert _Event(1.0, 43, lambda: None) < _Event(1.0, 89, lambda: None)
+    sim = Simulator()
+    sim._schedule(1.1, lambda: None)
+    sim._schedule(1.0, lambda: None)
+    sim._schedule(1.0, lambda: None)
+    assert [sim._pop()[:2] for _ in range(3)] == [(1.0, 1), (1.0, 2), (1.1, 0)]
 
 
 def test_event_order_misuse():
-    with pytest.raises(ValueError):
-        _Event(1.0, 89, lambda: None) < 5
+    # Event records are ordered through the (timestamp, identifier, event) entries of the event queue alone.
+    with pytest.raises(TypeError):
+        _Event(lambda: None) < _Event(lambda: None)
 
 
 def test_nonevent_inequality():
-    assert _Event(1.0, 89, lambda: None) != 5
+    assert _Event(lambda: None) != 5
+
+
+def test_event_make_same_as_constructor():
+    def fn(*args, **kwargs):
+        pass
+
+    assert _Event(fn, 1, 2, a=3) == _Event._make(fn, (1, 2), {"a": 3})
+    assert _Event(fn) == _Event._make(fn, (), {})
+    assert _Event(fn).kwargs == {}
+
+
+def test_schedule_kwargs():
+    ll = []
+    sim = Simulator()
+    sim._schedule(1.0, append, 1, ll=ll)
+    sim.run()
+    assert ll == [1]
 
 
 def test_schedule_none():
@@ -41,17 +66,17 @@ def append(n, ll):
     ll.append(n)
 
 
-def test_schedule_1_event():
+def test_schedule_1_event(calendar_type):
     ll = []
-    sim = Simulator()
+    sim = Simulator(scheduler=calendar_type())
     sim._schedule(1.0, append, 1, ll)
     sim.run()
     assert ll == [1]
 
 
-def test_schedule_multiple_events():
+def test_schedule_multiple_events(calendar_type):
     ll = []
-    sim = Simulator()
+    sim = Simulator(scheduler=calendar_type())
     sim._schedule(1.0, append, 1, ll)
     sim._schedule(0.7, append, 2, ll)
     sim._schedule(10.0, append, 3, ll)
@@ -67,7 +92,57 @@ def test_schedule_negative():
         sim._schedule(-0.5, append, 1, ll)
 
 
-def test_schedule_recurring():
+def test_schedule_many(calendar_type):
+    ll = []
+    sim = Simulator(scheduler=calendar_type())
+    sim._schedule(1.0, append, 0, ll)
+    ids = sim._schedule_many([(2.0, append, (1, ll)), (0.0, append, (2, ll)), (1.0, append, (3, ll))])
+    assert len(set(ids)) == 3
+    sim._cancel(ids[0])
+    sim.run()
+    assert ll == [2, 0, 3]
+
+
+def test_schedule_many_negative():
+    sim = Simulator()
+    ll = []
+    with pytest.raises(ValueError):
+        sim._schedule_many([(1.0, append, (1, ll)), (-0.5, append, (2, ll))])
+    assert list(sim.events()) == []
+
+
+def test_add_many(calendar_type):
+    log = []
+
+    def proc(n):
+        log.append((now(), n))
+        advance(1.0)
+        log.append((now(), n))
+
+    sim = Simulator(scheduler=calendar_type())
+    sim.add_in(1.5, proc, -1)
+    processes = sim.add_many(proc, [3.0, 0.0, 1.5, 2.0], ([n] for n in range(10)))
+    assert len(processes) == 4
+    assert all(isinstance(process, Process) for process in processes)
+    sim.run()
+    assert log == [
+        (0.0, 1), (1.0, 1), (1.5, -1), (1.5, 2), (2.0, 3), (2.5, -1), (2.5, 2), (3.0, 0), (3.0, 3), (4.0, 0)
+    ]
+
+
+def test_add_many_no_arguments():
+    log = []
+
+    def proc():
+        log.append(now())
+
+    sim = Simulator()
+    sim.add_many(proc, (float(n) for n in range(1000, 0, -1)))
+    sim.run()
+    assert log == [float(n) for n in range(1, 1001)]
+
+
+def test_schedule_recurring(calendar_type):
     ll = [0]
 
     def _append():
@@ -77,7 +152,7 @@ def test_schedule_recurring():
         else:
             sim.stop()
 
-    sim = Simulator()
+    sim = Simulator(scheduler=calendar_type())
     sim._schedule(1.0, _append)
     sim.run()
     assert sim.now() == 11.0
@@ -110,6 +185,235 @@ def test_schedule_cancel_last(sim_cancellable):
     assert sim.now() == 3.0
 
 
+def test_schedule_cancel_executed(sim_cancellable):
+    ll, sim, id_event = sim_cancellable
+    sim.run(2.0)
+    sim._cancel(id_event[0])  # Already executed: no-op.
+    sim._cancel(id_event[2])
+    sim.run()
+    assert ll == [1, 3]
+    assert len(sim._index_events) == 0
+
+
+def test_compaction_cancelled_events():
+    ll = []
+    sim = Simulator(ratio_compaction=0.5)
+    ids = [sim._schedule(float(n), append, n, ll) for n in range(1000)]
+    for n in range(500):
+        sim._cancel(ids[n])
+    assert sim.num_events_cancelled == 500
+    assert sim.num_compactions == 0
+    sim._cancel(ids[500])
+    assert sim.num_compactions == 1
+    assert sim.num_events_cancelled == 0
+    assert len(sim._events) == 499
+    sim.run()
+    assert ll == list(range(501, 1000))
+
+
+def test_compaction_counts_popped_cancelled():
+    ll = []
+    sim = Simulator()
+    ids = [sim._schedule(float(n), append, n, ll) for n in range(10)]
+    sim._cancel(ids[2])
+    sim._cancel(ids[7])
+    assert sim.num_events_cancelled == 2
+    sim.run(5.0)
+    assert sim.num_events_cancelled == 1
+    sim.run()
+    assert sim.num_events_cancelled == 0
+    assert sim.num_compactions == 0
+
+
+def test_compaction_ratio_invalid():
+    for ratio in [0.0, -0.5, 1.5]:
+        with pytest.raises(ValueError):
+            Simulator(ratio_compaction=ratio)
+
+
+def test_run_until(calendar_type):
+    ll = []
+    sim = Simulator(scheduler=calendar_type())
+    for n in [1, 3, 5]:
+        sim._schedule(n, append, n, ll)
+    sim.run_until(3.0)
+    assert ll == [1, 3]
+    assert sim.now() == 3.0
+    sim.run_until(4.5)
+    assert ll == [1, 3]
+    assert sim.now() == 4.5
+    with pytest.raises(ValueError):
+        sim.run_until(4.0)
+    sim.run_until(10.0)
+    assert ll == [1, 3, 5]
+    assert sim.now() == 10.0
+
+
+def test_run_slices_leave_no_event():
+    def tick():
+        while True:
+            advance(1.0)
+
+    sim = Simulator()
+    sim.add(tick)
+    for _ in range(100):
+        sim.run(0.25)
+    assert sim.now() == pytest.approx(25.0)
+    assert len(sim._events) == 1
+
+
+def test_run_horizon_events_scheduled_meanwhile(calendar_type):
+    ll = []
+    sim = Simulator(scheduler=calendar_type())
+    sim._schedule(2.0, append, 1, ll)
+    sim._schedule(1.0, lambda: sim._schedule(1.0, append, 2, ll))
+    sim.run(2.0)
+    assert ll == [1]
+    assert sim.now() == 2.0
+    sim.run()
+    assert ll == [1, 2]
+
+
+def test_run_negative_duration():
+    with pytest.raises(ValueError):
+        Simulator().run(-1.0)
+
+
+def test_ticks_clock_exact():
+    def ticker():
+        for _ in range(10000):
+            advance(0.001)
+
+    sim = Simulator(ticks_per_unit=10**9)
+    sim.add(ticker)
+    sim.run()
+    assert sim.now() == 10.0
+    assert sim.ticks_per_unit == 10**9
+
+
+def test_ticks_clock_scheduling():
+    log = []
+
+    def proc(n):
+        log.append((now(), n))
+
+    sim = Simulator(ts_now=1.5, ticks_per_unit=1000)
+    sim.add_at(2.0004, proc, 1)
+    sim.add_in(0.5, proc, 2)
+    sim.add_many(proc, [0.4996], [[3]])
+    assert sorted(ts for ts, *_ in sim.events()) == [2.0, 2.0, 2.0]
+    with pytest.raises(ValueError):
+        sim.add_at(1.4, proc, 4)
+    sim.run_until(2.0)
+    assert log == [(2.0, 1), (2.0, 2), (2.0, 3)]
+    sim.run(0.25)
+    assert sim.now() == 2.25
+    assert isinstance(sim._ts_now, int)
+
+
+def test_ticks_clock_invalid():
+    for ticks_per_unit in [0, -10, 0.5]:
+        with pytest.raises(ValueError):
+            Simulator(ticks_per_unit=ticks_per_unit)
+
+
+def test_zero_delay_after_same_time_calendar_events(calendar_type):
+    ll = []
+    sim = Simulator(scheduler=calendar_type())
+    sim._schedule(1.0, lambda: sim._schedule(0.0, append, "zero", ll))
+    sim._schedule(1.0, append, "same-time", ll)
+    sim._schedule(0.0, append, "first", ll)
+    sim.run()
+    assert ll == ["first", "same-time", "zero"]
+
+
+def test_zero_delay_events_cancel():
+    ll = []
+    sim = Simulator()
+    ids = [sim._schedule(0.0, append, n, ll) for n in range(5)]
+    sim._cancel(ids[1])
+    sim._cancel(ids[3])
+    assert len(list(sim.events())) == 3
+    sim.run()
+    assert ll == [0, 2, 4]
+    assert sim.num_events_cancelled == 0
+
+
+def run_mixed_model(handoff: bool, scheduler: Optional[Calendar] = None) -> List:
+    log = []
+    queue = Queue()
+    signal = Signal().turn_off()
+
+    def customer(n):
+        advance(n % 4)
+        try:
+            queue.join(timeout=3.0 + n % 5)
+            log.append((now(), n, "served"))
+            signal.wait()
+            advance(0.5)
+            log.append((now(), n, "out"))
+        except Timeout:
+            log.append((now(), n, "balk"))
+
+    def server():
+        while True:
+            advance(1.5)
+            queue.pop()
+            if int(now()) % 4 == 0:
+                signal.turn_on()
+            else:
+                signal.turn_off()
+
+    sim = Simulator(handoff=handoff, scheduler=scheduler)
+    for n in range(40):
+        sim.add(customer, n)
+    sim.add(server)
+    sim.run(30.0)
+    sim.run(30.0)
+    log.append(sim.now())
+    return log
+
+
+def test_handoff_preserves_order(calendar_type):
+    assert run_mixed_model(True, calendar_type()) == run_mixed_model(False)
+
+
+def test_handoff_advance_in_place():
+    def proc(ll):
+        for _ in range(10):
+            advance(1.0)
+            ll.append(len(list(sim.events())))
+
+    ll = []
+    sim = Simulator()
+    sim.add(proc, ll)
+    sim.run()
+    assert ll == [0] * 10
+    assert sim.now() == 10.0
+
+
+def test_handoff_respects_horizon():
+    def proc(ll):
+        while True:
+            advance(1.0)
+            ll.append(now())
+
+    ll = []
+    sim = Simulator()
+    sim.add(proc, ll)
+    sim.run(3.5)
+    assert ll == [1.0, 2.0, 3.0]
+    assert sim.now() == 3.5
+
+
+def test_handoff_many_processes_starting():
+    sim = Simulator()
+    for _ in range(5000):
+        sim.add(pause)
+    sim.run()
+    assert len(list(sim.events())) == 0
+
+
 def test_process_advance():
     def process(ll):
         ll.append(now())
@@ -144,13 +448,13 @@ def test_simulator_step():
     assert ll == pytest.approx([0.0, 1.0, 6.0])
 
 
-def test_process_multiple():
+def test_process_multiple(calendar_type):
     def tick(name, period, log):
         while True:
             advance(period)
             log.append((int(now()), name))
 
-    sim = Simulator()
+    sim = Simulator(scheduler=calendar_type())
     log = []
     sim.add(tick, "three", 3.0, log)
     sim.add(tick, "seven", 7.0, log)
@@ -164,14 +468,14 @@ def test_process_multiple():
                   ) == log
 
 
-def test_interleaved_sequence():
+def test_interleaved_sequence(calendar_type):
     def process(name, results, delay_start):
         advance(delay_start)
         for n in range(5):
             results.append((now(), name, n))
             advance(2)
 
-    sim = Simulator()
+    sim = Simulator(scheduler=calendar_type())
     results_p1 = []
     sim.add(process, "p1", results_p1, 0)
     results_p2 = []
@@ -334,6 +638,68 @@ def test_probing_current_process():
     assert not Process.current_exists()
 
 
+def test_current_simulator():
+    sims = []
+
+    def proc():
+        sims.append(Simulator.current())
+        advance(1.0)
+        sims.append(Simulator.current())
+
+    sim = Simulator()
+    sim.add(proc)
+    sim.run()
+    assert sims == [sim, sim]
+    with pytest.raises(TypeError):
+        Simulator.current()
+    with pytest.raises(TypeError):
+        now()
+
+
+def test_current_process_nested_simulation():
+    log = []
+
+    def inner():
+        advance(5.0)
+        log.append(("inner", now()))
+
+    def outer():
+        advance(1.0)
+        sim_inner = Simulator()
+        sim_inner.add(inner)
+        sim_inner.run()
+        log.append(("outer", now(), Process.current() is proc_outer))
+
+    sim = Simulator()
+    proc_outer = sim.add(outer)
+    sim.run()
+    assert log == [("inner", 5.0), ("outer", 1.0, True)]
+
+
+def test_current_process_teardown_from_process():
+    log = []
+
+    def hanging():
+        try:
+            advance(10.0)
+        finally:
+            log.append(local.name)
+
+    def proc():
+        sim_other = Simulator()
+        sim_other.add(hanging)
+        sim_other.run(5.0)
+        advance(1.0)
+        del sim_other
+        gc.collect()
+        log.append((now(), Process.current() is proc_main))
+
+    sim = Simulator()
+    proc_main = sim.add(proc)
+    sim.run()
+    assert log == ["process-0", (1.0, True)]
+
+
 def test_process_adding_process():
     log = []
 
@@ -417,20 +783,67 @@ def test_local_replace_hierarchy():
     sim_add_run(proc)
 
 
-def is_uuid(s: str) -> bool:
-    return re.match('[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}', s) is not None
+def test_local_get_unknown_does_not_store():
+    def proc():
+        assert local.unknown.deeper is not None
+        assert Process.current().local._params is None
+        with pytest.raises(AttributeError):
+            del local.unknown
+        local.unknown.deeper.value = 3
+        assert local.unknown.deeper.value == 3
+        assert list(Process.current().local._params) == ["unknown"]
+        del local.unknown
+        assert local.unknown.deeper.value != 3
+
+    sim_add_run(proc)
+
+
+def test_local_kept_placeholder_read_after_write():
+    def proc():
+        stats = local.stats
+        stats.count = 1
+        assert stats.count == 1
+        assert local.stats.count == 1
+        deeper = local.a.b
+        deeper.c = 2
+        assert deeper.c == 2
+        assert local.a.b.c == 2
+        stats.count += 1
+        assert local.stats.count == 2
+        del stats.count
+        assert local.stats.count != 2
+        with pytest.raises(AttributeError):
+            del local.other.count
+
+    sim_add_run(proc)
 
 
 def test_process_has_default_name():
+    names = []
+
     def proc():
         assert isinstance(local.name, str)
-        assert is_uuid(local.name)
+        names.append(local.name)
 
-    sim_add_run(proc)
+    sim = Simulator()
+    sim.add_many(proc, [0.0] * 3)
+    sim.run()
+    assert names == ["process-0", "process-1", "process-2"]
 
 
 def test_named_default_name():
-    assert(is_uuid(Named(None).name))
+    names = [Named(None).name for _ in range(3)] + [Named("").name, Signal().name]
+    assert all(isinstance(name, str) and name for name in names)
+    assert len(set(names)) == len(names)
+
+
+def test_named_default_name_lazy():
+    signal = Signal()
+    assert signal._name is None
+    assert signal._queue._name is None
+    assert signal._queue.name == signal.name + "-queue"
+    resource = Resource(name="the-resource")
+    assert resource._waiting.name == "the-resource-queue"
 
 
 def test_named_set_name():
@@ -577,80 +990,245 @@ def test_cancel_timeout():
     assert log == [("a", "finish")]
 
 
-class InterruptCustom(Interrupt):
-    pass
-
-
-def test_timeout_interrupt():
+def test_queue_many_timeouts():
     queue = Queue()
-    sim = Simulator()
     log = []
 
-    def queueing():
-        log.append("queued")
+    def impatient(n):
         try:
-            queue.join(timeout=100)
-        except InterruptCustom:
-            log.append("interrupt")
+            queue.join(timeout=float(n % 2 + 1))
+            log.append((n, "served"))
+        except Timeout:
+            log.append((n, "balk"))
 
-    proc_queueing = sim.add(queueing)
-    sim.run(50)
-    assert(log == ["queued"])
-    assert(len(queue) == 1)
+    def server():
+        while True:
+            advance(1.5)
+            queue.pop()
 
-    proc_queueing.interrupt(InterruptCustom())
-    sim.run(10)
-    assert(log == ["queued", "interrupt"])
-    assert(len(queue) == 0)
-    assert(len(list(sim.events())) == 0)
+    sim = Simulator()
+    sim.add_many(impatient, repeat(0.0, 1000), [[n] for n in range(1000)])
+    sim.add(server)
+    sim.run(3.0)
+    assert queue.is_empty()
+    assert len(queue._waiting) == 0
+    assert log[0] == (0, "balk")
+    assert (1, "served") in log
+    assert sum(1 for _, what in log if what == "served") == 1
 
 
-def wait_for(signal: Signal, times_expected: List[float], delay_between: float, log: List[float] = []):
-    for expected in times_expected:
-        advance(delay_between)
-        signal.wait()
-        assert pytest.approx(expected) == now()
-        log.append(now())
+def test_queue_timeout_timer():
+    queue = Queue()
+    log = []
 
+    def impatient():
+        try:
+            queue.join(timeout=5.0)
+            log.append(("served", now()))
+        except Timeout:
+            log.append(("balk", now()))
 
-def test_signal_already_on():
     sim = Simulator()
-    signal = Signal().turn_on()
-    log = []
-    expectation = [1.0]
-    sim.add(wait_for, signal, expectation, 1.0, log)
+    sim.add(impatient)
+    sim.add(impatient)
+    sim.add_in(2.0, queue.pop)
+    sim.run(3.0)
+    assert sim._counter_processes == 3  # No process is started to time out the wait.
+    assert len(list(sim.events())) == 1
     sim.run()
-    assert expectation == log
+    assert log == [("served", 2.0), ("balk", 5.0)]
+    assert queue.is_empty()
 
 
-def test_signal_wait_a_while():
-    sim = Simulator()
-    signal = Signal().turn_off()
+def test_queue_timeout_same_instant_as_pop():
+    queue = Queue()
     log = []
-    expectation = [3.0, 4.0]
-    sim.add(wait_for, signal, expectation, 1.0, log)
-    sim._schedule(3.0, signal.turn_on)
-    sim.run()
-    assert expectation == log
 
+    def popper():
+        advance(1.0)
+        queue.pop()
+
+    def impatient():
+        try:
+            queue.join(timeout=1.0)
+            log.append(("served", now()))
+        except Timeout:
+            log.append(("balk", now()))
+        advance(5.0)
+        log.append(("done", now()))
 
-def test_signal_toggling():
     sim = Simulator()
-    signal = Signal().turn_off()
-    log = []
-    expectation = [3.0, 4.0, 10.0, 13.0, 14.0, 15.0]
-    sim.add(wait_for, signal, expectation, 1.0, log)
-    sim._schedule(3.0, signal.turn_on)
-    sim._schedule(4.5, signal.turn_off)
-    sim._schedule(10.0, signal.turn_on)
-    sim._schedule(10.1, signal.turn_off)
-    sim._schedule(13.0, signal.turn_on)
+    sim.add(popper)
+    sim.add(impatient)
     sim.run()
-    assert expectation == log
+    assert log == [("served", 1.0), ("done", 6.0)]
+    assert len(list(sim.events())) == 0
 
 
-def test_signal_waiter_turning_off():
-    def waiter_turning_off(signal: Signal, log: List[float]):
+def test_resource_timeout_same_instant_as_grant():
+    resource = Resource(1)
+    log = []
+
+    def holder():
+        resource.take()
+        advance(1.0)
+        resource.release()
+
+    def impatient(n):
+        try:
+            resource.take(timeout=1.0)
+        except Timeout:
+            log.append((now(), n, "balk"))
+            return
+        log.append((now(), n, "take"))
+        advance(2.0)
+        resource.release()
+        log.append((now(), n, "release"))
+
+    sim = Simulator()
+    sim.add(holder)
+    sim.add(impatient, 1)
+    sim.add(impatient, 2)
+    sim.run()
+    assert log == [(1.0, 2, "balk"), (1.0, 1, "take"), (3.0, 1, "release")]
+    assert resource.num_instances_free == 1
+
+
+def test_queue_fifo():
+    queue = Queue(fifo=True)
+    log = []
+    sim = Simulator()
+    procs = [sim.add(queuer, n, queue, log, 0.0) for n in range(5)]
+    sim.run()
+    assert len(queue) == 5
+    assert queue.peek() is procs[0]
+    procs[0].interrupt()
+    procs[2].interrupt()
+    sim.run()
+    assert len(queue) == 3
+    assert queue.peek() is procs[1]
+    queue.reprioritize(procs[3])
+    while not queue.is_empty():
+        queue.pop()
+        sim.run()
+    assert log == [1, 3, 4]
+    with pytest.raises(ValueError):
+        Queue(lambda counter: counter, fifo=True)
+
+
+def test_queue_equal_tokens():
+    queue = Queue(lambda counter: 0)
+    log = []
+    sim = Simulator()
+    for n in range(5):
+        sim.add(queuer, n, queue, log, 0.0)
+    sim.run()
+    for _ in range(5):
+        queue.pop()
+        sim.run()
+    assert log == list(range(5))
+
+
+def test_queue_reprioritize():
+    queue = Queue(lambda counter: (-local.priority, counter))
+    log = []
+
+    def customer(n):
+        local.priority = n
+        queue.join()
+        log.append(n)
+
+    sim = Simulator()
+    customers = sim.add_many(customer, repeat(0.0, 5), [[n] for n in range(5)])
+    sim.run()
+    assert queue.peek() is customers[4]
+    customers[1].local.priority = 10
+    queue.reprioritize(customers[1])
+    customers[4].local.priority = -1
+    queue.reprioritize(customers[4])
+    assert len(queue) == 5
+    while not queue.is_empty():
+        queue.pop()
+        sim.run()
+    assert log == [1, 3, 2, 0, 4]
+    with pytest.raises(ValueError):
+        queue.reprioritize(customers[0])
+
+
+class InterruptCustom(Interrupt):
+    pass
+
+
+def test_timeout_interrupt():
+    queue = Queue()
+    sim = Simulator()
+    log = []
+
+    def queueing():
+        log.append("queued")
+        try:
+            queue.join(timeout=100)
+        except InterruptCustom:
+            log.append("interrupt")
+
+    proc_queueing = sim.add(queueing)
+    sim.run(50)
+    assert(log == ["queued"])
+    assert(len(queue) == 1)
+
+    proc_queueing.interrupt(InterruptCustom())
+    sim.run(10)
+    assert(log == ["queued", "interrupt"])
+    assert(len(queue) == 0)
+    assert(len(list(sim.events())) == 0)
+
+
+def wait_for(signal: Signal, times_expected: List[float], delay_between: float, log: List[float] = []):
+    for expected in times_expected:
+        advance(delay_between)
+        signal.wait()
+        assert pytest.approx(expected) == now()
+        log.append(now())
+
+
+def test_signal_already_on():
+    sim = Simulator()
+    signal = Signal().turn_on()
+    log = []
+    expectation = [1.0]
+    sim.add(wait_for, signal, expectation, 1.0, log)
+    sim.run()
+    assert expectation == log
+
+
+def test_signal_wait_a_while():
+    sim = Simulator()
+    signal = Signal().turn_off()
+    log = []
+    expectation = [3.0, 4.0]
+    sim.add(wait_for, signal, expectation, 1.0, log)
+    sim._schedule(3.0, signal.turn_on)
+    sim.run()
+    assert expectation == log
+
+
+def test_signal_toggling():
+    sim = Simulator()
+    signal = Signal().turn_off()
+    log = []
+    expectation = [3.0, 4.0, 10.0, 13.0, 14.0, 15.0]
+    sim.add(wait_for, signal, expectation, 1.0, log)
+    sim._schedule(3.0, signal.turn_on)
+    sim._schedule(4.5, signal.turn_off)
+    sim._schedule(10.0, signal.turn_on)
+    sim._schedule(10.1, signal.turn_off)
+    sim._schedule(13.0, signal.turn_on)
+    sim.run()
+    assert expectation == log
+
+
+def test_signal_waiter_turning_off():
+    def waiter_turning_off(signal: Signal, log: List[float]):
         signal.wait()
         signal.turn_off()
         log.append(now())
@@ -667,6 +1245,33 @@ def test_signal_waiter_turning_off():
     assert schedule_signal_on == pytest.approx(log_time)
 
 
+def test_signal_turn_on_single_event():
+    log = []
+    signal = Signal(lambda counter: -counter).turn_off()
+
+    def waiter(n):
+        signal.wait()
+        log.append((now(), n))
+        advance(1.0)
+        log.append((now(), n))
+
+    def waiter_generator(n):
+        yield signal.wait()
+        log.append((now(), n))
+        yield 1.0
+        log.append((now(), n))
+
+    sim = Simulator()
+    for n in range(4):
+        sim.add(waiter_generator if n % 2 else waiter, n)
+    sim.run(1.0)
+    signal.turn_on()
+    assert signal._queue.is_empty()
+    assert len(list(sim.events())) == 1
+    sim.run()
+    assert log == [(1.0, 3), (1.0, 2), (1.0, 1), (1.0, 0), (2.0, 3), (2.0, 2), (2.0, 1), (2.0, 0)]
+
+
 def turn_on(delay: float, signal: Signal) -> None:
     advance(delay)
     signal.turn_on()
@@ -779,6 +1384,272 @@ def test_select_timeout_bad_parameter():
         sim.run()
 
 
+def test_select_resumed_once():
+    sigs = [Signal().turn_off() for n in range(3)]
+    log = []
+
+    def selecter() -> None:
+        signals_on = select(*sigs, sigs[0])
+        log.append((now(), signals_on))
+        advance(5.0)
+        log.append(now())
+
+    sim = Simulator()
+    sim.add(selecter)
+    sim.run(1.0)
+    assert [len(sig._queue) for sig in sigs] == [1, 1, 1]
+    assert len(list(sim.events())) == 0
+    sigs[2].turn_on()
+    assert [len(sig._queue) for sig in sigs] == [0, 0, 0]
+    sigs[0].turn_on()
+    sim.run()
+    assert log == [(1.0, [sigs[0], sigs[2], sigs[0]]), 6.0]
+
+
+def test_select_rejoin_signal_off():
+    sigs = [Signal().turn_off() for n in range(2)]
+    log = []
+
+    def selecter() -> None:
+        signals_on = select(*sigs)
+        log.append((now(), signals_on))
+
+    sim = Simulator()
+    sim.add(selecter)
+    sim.add_in(1.0, sigs[0].turn_on)
+    sim.add_in(1.0, sigs[0].turn_off)
+    sim.add_in(3.0, sigs[1].turn_on)
+    sim.run()
+    assert log == [(3.0, [sigs[1]])]
+    assert [len(sig._queue) for sig in sigs] == [0, 0]
+
+
+def test_select_interrupt_leaves_queues():
+    sigs = [Signal().turn_off() for n in range(2)]
+
+    def selecter() -> None:
+        with pytest.raises(Interrupt):
+            select(*sigs)
+
+    sim = Simulator()
+    proc = sim.add(selecter)
+    sim.run(1.0)
+    proc.interrupt()
+    sim.run()
+    assert [len(sig._queue) for sig in sigs] == [0, 0]
+
+
+def test_select_timeout_same_instant_as_turn_on():
+    sigs = [Signal().turn_off() for n in range(2)]
+    log = []
+
+    def selecter() -> None:
+        try:
+            signals_on = select(*sigs, timeout=3.0)
+            log.append((now(), signals_on))
+        except Timeout:
+            log.append((now(), "timeout"))
+        advance(5.0)
+        log.append(now())
+
+    sim = Simulator()
+    sim.add_in(1.0, sigs[0].turn_on)
+    sim.add_in(1.0, sigs[0].turn_off)
+    sim.add_in(3.0, sigs[1].turn_on)
+    sim.add(selecter)
+    sim.run()
+    assert log == [(3.0, [sigs[1]]), 8.0]
+    assert len(list(sim.events())) == 0
+
+
+def test_select_timeout_after_rejoin():
+    sigs = [Signal().turn_off() for n in range(2)]
+    log = []
+
+    def selecter() -> None:
+        try:
+            select(*sigs, timeout=3.0)
+        except Timeout:
+            log.append((now(), "timeout"))
+
+    sim = Simulator()
+    sim.add(selecter)
+    sim.add_in(1.0, sigs[0].turn_on)
+    sim.add_in(1.0, sigs[0].turn_off)
+    sim.run()
+    assert log == [(3.0, "timeout")]
+    assert [len(sig._queue) for sig in sigs] == [0, 0]
+
+
+def test_select_generator_gc(monkeypatch):
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+
+    def selecter(sigs):
+        yield select(*sigs)
+
+    sim = Simulator()
+    sim.add(selecter, [Signal().turn_off() for n in range(2)])
+    sim.run()
+    sim = None
+    gc.collect()
+    assert unraisable == []
+
+
+def test_condition_notify_key():
+    condition = Condition()
+    log = []
+
+    def waiter(key):
+        condition.wait(key)
+        log.append((now(), key))
+
+    sim = Simulator()
+    for key in ["a", "b", "a", "c"]:
+        sim.add(waiter, key)
+    sim.run(1.0)
+    assert [condition.num_waiting(key) for key in "abc"] == [2, 1, 1]
+    condition.notify("a")
+    sim.run(1.0)
+    assert log == [(1.0, "a"), (1.0, "a")]
+    condition.notify("d").notify_all()
+    sim.run()
+    assert log == [(1.0, "a"), (1.0, "a"), (2.0, "b"), (2.0, "c")]
+    assert condition._queues == {}
+
+
+def test_condition_predicate():
+    condition = Condition()
+    stock = 0
+    log = []
+
+    def buyer(name, quantity):
+        nonlocal stock
+        condition.wait(predicate=lambda: stock >= quantity)
+        stock -= quantity
+        log.append((now(), name))
+
+    def restock(quantity):
+        nonlocal stock
+        stock += quantity
+        condition.notify()
+
+    sim = Simulator()
+    sim.add(buyer, "big", 5)
+    sim.add(buyer, "small", 2)
+    sim.add(buyer, "medium", 3)
+    sim.add_in(1.0, restock, 2)
+    sim.add_in(2.0, restock, 5)
+    sim.add_in(3.0, restock, 1)
+    sim.run(1.5)
+    assert log == [(1.0, "small")]
+    assert condition.num_waiting() == 2
+    sim.run()
+    # Both big and medium buyers are resumed at 2.0, but the big one takes all the stock, so the medium one waits again.
+    assert log == [(1.0, "small"), (2.0, "big")]
+    assert condition.num_waiting() == 1
+
+
+def test_condition_predicate_already_holds():
+    condition = Condition()
+    log = []
+
+    def waiter():
+        condition.wait(predicate=lambda: True)
+        log.append(now())
+
+    sim = Simulator()
+    sim.add_in(1.0, waiter)
+    sim.run()
+    assert log == [1.0]
+    assert condition.num_waiting() == 0
+
+
+def test_condition_timeout():
+    condition = Condition()
+    log = []
+
+    def waiter(name, timeout):
+        try:
+            yield condition.wait("k", timeout=timeout)
+            log.append((now(), name, "notified"))
+        except Timeout:
+            log.append((now(), name, "timeout"))
+
+    sim = Simulator()
+    sim.add(waiter, "a", 2.0)
+    sim.add(waiter, "b", 10.0)
+    sim.add_in(5.0, condition.notify, "k")
+    sim.run()
+    assert log == [(2.0, "a", "timeout"), (5.0, "b", "notified")]
+    assert condition.num_waiting("k") == 0
+
+
+def test_condition_timeout_same_instant_as_notify():
+    condition = Condition()
+    state = {"ready": False}
+    log = []
+
+    def waiter():
+        try:
+            condition.wait("k", lambda: state["ready"], timeout=3.0)
+            log.append((now(), "notified"))
+        except Timeout:
+            log.append((now(), "timeout"))
+        advance(5.0)
+        log.append(now())
+
+    def notify(ready):
+        state["ready"] = ready
+        condition.notify("k")
+
+    sim = Simulator()
+    sim.add_in(3.0, notify, True)
+    sim.add(waiter)
+    sim.run()
+    assert log == [(3.0, "notified"), 8.0]
+    assert len(list(sim.events())) == 0
+
+
+def test_condition_timeout_after_rewait():
+    condition = Condition()
+    state = {"ready": False}
+    log = []
+
+    def waiter():
+        try:
+            condition.wait("k", lambda: state["ready"], timeout=3.0)
+        except Timeout:
+            log.append((now(), "timeout"))
+
+    def notify(ready):
+        state["ready"] = ready
+        condition.notify("k")
+
+    sim = Simulator()
+    sim.add(waiter)
+    sim.add_in(1.0, notify, True)
+    sim.add_in(1.0, state.__setitem__, "ready", False)
+    sim.run()
+    assert log == [(3.0, "timeout")]
+    assert condition.num_waiting("k") == 0
+
+
+def test_condition_generator_gc(monkeypatch):
+    unraisable = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+
+    def waiter(condition):
+        yield condition.wait("k", lambda: False)
+
+    sim = Simulator()
+    sim.add(waiter, Condition())
+    sim.run()
+    sim = None
+    gc.collect()
+    assert unraisable == []
+
+
 def do_while_holding_resource(delay: float, log: List[float]):
     advance(delay)
     log.append(now())
@@ -890,7 +1761,172 @@ def test_resource_timeout():
     assert log == [("b", "balk"), ("a", "finish")]
 
 
-class SimulatorWithDestructor(Simulator):
+def test_resource_release_many_waiters():
+    resource = Resource(5)
+    log = []
+
+    def user(name, num_instances, delay):
+        resource.take(num_instances)
+        log.append((now(), name, resource.num_instances_free))
+        advance(delay)
+        resource.release(num_instances)
+
+    sim = Simulator()
+    sim.add(user, "all", 5, 10.0)
+    for name, num_instances in [("a", 2), ("b", 1), ("c", 2), ("d", 4), ("e", 1)]:
+        sim.add_in(1.0, user, name, num_instances, 10.0)
+    sim.add_in(10.0, user, "late", 1, 1.0)
+    sim.run()
+    assert log == [
+        (0.0, "all", 0),
+        (10.0, "a", 0),
+        (10.0, "b", 0),
+        (10.0, "c", 0),
+        (20.0, "d", 0),
+        (20.0, "e", 0),
+        (30.0, "late", 4)
+    ]
+    assert resource.num_instances_total == 5
+    assert resource.num_instances_free == 5
+
+
+def test_resource_interrupt_after_grant():
+    resource = Resource(2)
+    log = []
+
+    def holder():
+        resource.take(2)
+        advance(5.0)
+        resource.release(2)
+
+    def waiter(name):
+        try:
+            resource.take(1)
+            log.append((now(), name, "take"))
+            resource.release(1)
+        except Interrupt:
+            log.append((now(), name, "interrupted"))
+
+    sim = Simulator()
+    sim.add(holder)
+    proc = sim.add_in(1.0, waiter, "a")
+    sim.add_in(2.0, waiter, "b")
+    sim.add_in(2.0, waiter, "c")
+    sim._schedule(5.0, proc.interrupt)
+    sim.run()
+    assert log == [(5.0, "a", "interrupted"), (5.0, "b", "take"), (5.0, "c", "take")]
+    assert resource.num_instances_free == 2
+
+
+def test_resource_departure_unblocks_waiters():
+    resource = Resource(4)
+    log = []
+
+    def holder(num_instances, duration):
+        resource.take(num_instances)
+        advance(duration)
+        resource.release(num_instances)
+
+    def big():
+        try:
+            resource.take(4, timeout=5.0)
+        except Timeout:
+            log.append((now(), "big", "timeout"))
+
+    def small():
+        resource.take(3)
+        log.append((now(), "small", "take"))
+        resource.release(3)
+
+    sim = Simulator()
+    sim.add(holder, 3, 3.0)
+    sim.add(holder, 1, 100.0)
+    sim.add_in(1.0, big)
+    sim.add_in(2.0, small)
+    sim.run()
+    assert log == [(6.0, "big", "timeout"), (6.0, "small", "take")]
+    assert resource.num_instances_free == 4
+
+
+def test_resource_spurious_resume():
+    resource = Resource(1)
+    log = []
+
+    def holder():
+        resource.take()
+        advance(5.0)
+        resource.release()
+
+    def waiter(name):
+        resource.take()
+        log.append((now(), name, "take"))
+        advance(1.0)
+        resource.release()
+
+    sim = Simulator()
+    sim.add(holder)
+    proc = sim.add_in(1.0, waiter, "a")
+    sim.add_in(2.0, waiter, "b")
+    sim._schedule(3.0, proc.resume)
+    sim.run()
+    assert log == [(5.0, "b", "take"), (6.0, "a", "take")]
+    assert resource.num_instances_free == 1
+    assert len(resource._waiting) == 0
+
+
+def run_backfill(backfill):
+    resource = Resource(4, backfill=backfill)
+    log = []
+
+    def job(name, num_instances, duration):
+        resource.take(num_instances)
+        log.append((now(), name))
+        advance(duration)
+        resource.release(num_instances)
+
+    sim = Simulator()
+    sim.add(job, "first", 3, 10.0)
+    sim.add_in(1.0, job, "big", 4, 5.0)
+    sim.add_in(2.0, job, "small", 1, 3.0)
+    sim.add_in(3.0, job, "medium", 2, 3.0)
+    sim.add_in(4.0, job, "tiny", 1, 3.0)
+    sim.run()
+    assert resource.num_instances_free == 4
+    assert resource._waiting_by_size == {}
+    return log
+
+
+def test_resource_no_backfill():
+    assert run_backfill(False) == [
+        (0.0, "first"), (2.0, "small"), (10.0, "big"), (15.0, "medium"), (15.0, "tiny")
+    ]
+
+
+def test_resource_backfill_first_fit():
+    assert run_backfill(True) == [
+        (0.0, "first"), (2.0, "small"), (5.0, "tiny"), (10.0, "big"), (15.0, "medium")
+    ]
+
+
+def test_resource_backfill_queue_order():
+    resource = Resource(3, get_order_token=lambda counter: -counter, backfill=True)
+    log = []
+
+    def job(name, num_instances):
+        resource.take(num_instances)
+        log.append((now(), name))
+        advance(1.0)
+        resource.release(num_instances)
+
+    sim = Simulator()
+    sim.add(job, "first", 3)
+    for n, num_instances in enumerate([1, 2, 1, 3]):
+        sim.add_in(0.5, job, f"job-{n}", num_instances)
+    sim.run()
+    assert log == [(0.0, "first"), (1.0, "job-3"), (2.0, "job-2"), (2.0, "job-1"), (3.0, "job-0")]
+
+
+class SimulatorWithDestructor(Simulator):
 
     def __init__(self, log_destroy):
         super().__init__()
@@ -954,6 +1990,238 @@ def test_simulator_context_manager(log_destroy):
     assert log_destroy[0:7] == ["A finish", "B EXIT", "B finish", "D EXIT", "D finish", "C EXIT", "C finish"]
 
 
+def test_processes_tagged_failed_scheduling():
+    @tagged(TestTag.ALICE)
+    def proc():
+        advance(1.0)
+
+    sim = Simulator()
+    with pytest.raises(ValueError):
+        sim.add_many(proc, [1.0, 2.0, -1.0])
+    with pytest.raises(ValueError):
+        sim.add_in(-1.0, proc)
+    with pytest.raises(ValueError):
+        sim.add_at(-1.0, proc)
+    assert sim.num_processes_tagged(TestTag.ALICE) == 0
+    assert list(sim.events()) == []
+    sim.run()
+    assert sim.num_processes_tagged(TestTag.ALICE) == 0
+
+
+def test_process_pool_reuse():
+    log = []
+
+    @tagged(TestTag.ALICE)
+    def customer(n, wait=1.0):
+        assert local.served is not True
+        local.served = True
+        advance(wait)
+        log.append((now(), n, Process.current().has_tag(TestTag.ALICE)))
+
+    def untagged_customer(n):
+        assert not Process.current().has_tag(TestTag.ALICE)
+        assert local.served is not True
+        advance(0.5)
+        log.append((now(), n, False))
+
+    def source():
+        for n in range(10):
+            add(customer, n, wait=2.0)
+            advance(1.0)
+            add(untagged_customer, -n)
+
+    sim = Simulator(pool_size=4)
+    sim.add(source)
+    sim.run()
+    assert sorted(n for _, n, _ in log) == sorted(list(range(10)) + [-n for n in range(10)])
+    assert all(tagged == (n >= 0) for _, n, tagged in log if n != 0)
+    assert sim.num_pool_hits > 0
+    assert sim.num_pool_hits + sim.num_pool_misses == 21
+    assert len(sim._pool) <= 4
+
+
+def test_process_pool_disabled_by_default():
+    sim = Simulator()
+    processes = sim.add_many(append, [0.0, 1.0, 2.0], [[n, []] for n in range(3)])
+    sim.run()
+    assert all(process.dead for process in processes)
+    assert sim.num_pool_hits == 0
+    assert sim.num_pool_misses == 3
+
+
+def test_process_pool_gc():
+    sim = Simulator(pool_size=10)
+    sim.add_many(advance, [0.0, 1.0, 2.0], [[1.0]] * 3)
+    sim.run()
+    processes = list(sim._pool)
+    assert len(processes) == 3
+    assert not any(process.dead for process in processes)
+    sim = None
+    gc.collect()
+    assert all(process.dead for process in processes)
+
+
+def test_process_pool_stale_interrupt_resume():
+    log = []
+
+    def short():
+        log.append((now(), "short"))
+
+    def proc(n):
+        advance(1.0)
+        log.append((now(), n))
+
+    sim = Simulator(pool_size=4)
+    process = sim.add(short)
+    sim.run()
+    process.interrupt()
+    process.resume()
+    sim.run()
+    assert len(sim._pool) == 1 and not process.dead
+    sim.add(proc, 1)
+    sim.run()
+    assert log == [(0.0, "short"), (1.0, 1)]
+
+
+def test_process_pool_stale_resume_after_reuse():
+    log = []
+    sig = Signal().turn_off()
+
+    def waiter():
+        try:
+            sig.wait()
+        except Interrupt:
+            pass
+
+    def victim():
+        advance(5.0)
+        log.append(now())
+
+    def reuser(process):
+        advance(1.0)
+        process.interrupt()
+        advance(0.0)
+        add(victim)
+
+    def turner():
+        advance(1.0)
+        sig.turn_on()
+
+    sim = Simulator(pool_size=4)
+    process = sim.add(waiter)
+    sim.add(reuser, process)
+    sim.add(turner)
+    sim.run()
+    assert sim.num_pool_hits == 1
+    assert log == [6.0]
+
+
+def test_process_pool_interpreter_exit():
+    script = "\n".join([
+        "from greensim import Simulator, advance",
+        "sim = Simulator(pool_size=4)",
+        "sim.add(advance, 1.0)",
+        "sim.run()"
+    ])
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    assert result.returncode == 0
+    assert result.stderr == b""
+
+
+def test_process_pool_skips_dead():
+    log = []
+    sim = Simulator(pool_size=4)
+    sim.add_many(append, [0.0, 0.0], [[n, log] for n in range(2)])
+    sim.run()
+    sim._pool[-1].throw()
+    sim.add(append, 2, log)
+    sim.run()
+    assert log == [0, 1, 2]
+
+
+def test_process_pool_teardown_during_other_simulation():
+    log = []
+
+    def pooled_sim():
+        sim = Simulator(pool_size=4)
+        sim.add(append, 0, [])
+        sim.run()
+
+    def proc():
+        advance(1.0)
+        pooled_sim()
+        gc.collect()
+        log.append(now())
+        advance(1.0)
+        log.append(now())
+
+    sim = Simulator()
+    sim.add(proc)
+    sim.run()
+    assert log == [1.0, 2.0]
+
+
+def test_processes_tagged():
+    queue = Queue()
+    log = []
+
+    @tagged(TestTag.ALICE)
+    def waiter(n):
+        try:
+            queue.join()
+            log.append((now(), n, "served"))
+        except Interrupt:
+            log.append((now(), n, "interrupted"))
+
+    def bob():
+        Process.current().tag_with(TestTag.BOB)
+        advance(1.0)
+        Process.current().untag(TestTag.BOB)
+        advance(1.0)
+
+    sim = Simulator()
+    waiters = sim.add_many(waiter, [1.0, 2.0, 2.2], [[n] for n in range(3)])
+    sim.add(bob)
+    sim.run(0.5)
+    assert sim.processes_tagged(TestTag.ALICE) == waiters
+    assert sim.num_processes_tagged(TestTag.BOB) == 1
+    sim.run(1.0)
+    assert sim.num_processes_tagged(TestTag.BOB) == 0
+    sim._schedule(0.0, queue.pop)
+    sim.run(1.0)
+    assert sim.processes_tagged(TestTag.ALICE) == waiters[1:]
+    assert sim.interrupt_tagged(TestTag.ALICE) == 2
+    sim.run()
+    assert log == [(1.5, 0, "served"), (2.5, 1, "interrupted"), (2.5, 2, "interrupted")]
+    assert sim.num_processes_tagged(TestTag.ALICE) == 0
+
+
+def test_processes_tagged_pooled():
+    @tagged(TestTag.ALICE)
+    def alice():
+        advance(1.0)
+
+    def source():
+        for _ in range(5):
+            add(alice)
+            add(advance, 1.0)
+            advance(2.0)
+
+    sim = Simulator(pool_size=4)
+    sim.add(source)
+    for n in range(5):
+        sim.run(1.5)
+        assert sim.num_processes_tagged(TestTag.ALICE) == 0
+        sim.run(0.5)
+        assert sim.num_processes_tagged(TestTag.ALICE) == (1 if n < 4 else 0)
+    assert sim.num_pool_hits > 0
+
+
 def test_tagged_constructor():
     @tagged(TestTag.ALICE)
     def f():
@@ -1057,3 +2325,309 @@ def test_tagged_process_add_at():
 
     run_test_tagged_add(good_launch, 2 * step)
     run_test_tagged_add_extra_tag(good_launch, 2 * step)
+
+
+def test_base_process_abstract():
+    with pytest.raises(TypeError):
+        BaseProcess()
+
+
+def test_generator_process_advance():
+    log = []
+
+    def ticker(name, delay):
+        for _ in range(3):
+            yield advance(delay)
+            log.append((now(), name))
+
+    def greenlet_ticker():
+        for _ in range(2):
+            advance(1.5)
+            log.append((now(), "greenlet"))
+
+    sim = Simulator()
+    proc = sim.add(ticker, "gen", 1.0)
+    sim.add(greenlet_ticker)
+    sim.run()
+    assert isinstance(proc, GeneratorProcess)
+    assert proc.dead
+    assert log == [(1.0, "gen"), (1.5, "greenlet"), (2.0, "gen"), (3.0, "greenlet"), (3.0, "gen")]
+
+
+def test_generator_process_yield_delay_and_generator():
+    log = []
+
+    def sub(delay):
+        yield delay
+        return now()
+
+    def body():
+        yield 2
+        moment = yield sub(3.0)
+        log.append((now(), moment))
+        yield
+        log.append(now())
+
+    sim = Simulator()
+    proc = sim.add(body)
+    sim.run()
+    assert log == [(5.0, 5.0)]
+    sim._schedule(1.0, proc.resume)
+    sim.run()
+    assert log == [(5.0, 5.0), 6.0]
+
+
+def test_generator_process_interrupt():
+    log = []
+
+    def sleeper():
+        try:
+            yield advance(10.0)
+        except Interrupt:
+            log.append(("interrupted", now()))
+        yield advance(1.0)
+        log.append(("done", now()))
+
+    def dying():
+        yield advance(10.0)
+        log.append("should not happen")
+
+    def interrupter(procs):
+        advance(3.0)
+        for proc in procs:
+            proc.interrupt()
+
+    sim = Simulator()
+    procs = [sim.add(sleeper), sim.add(dying)]
+    sim.add(interrupter, procs)
+    sim.run()
+    assert log == [("interrupted", 3.0), ("done", 4.0)]
+    assert sim.now() == 4.0
+
+
+def test_generator_process_exception():
+    def failing():
+        yield 1.0
+        raise RuntimeError("fail")
+
+    sim = Simulator()
+    sim.add(failing)
+    with pytest.raises(RuntimeError):
+        sim.run()
+
+
+def test_generator_process_queue_resource():
+    queue = Queue()
+    counter = Resource(2)
+    log = []
+
+    def customer(n):
+        yield counter.take()
+        yield advance(1.0)
+        log.append((now(), n, "counter"))
+        counter.release()
+        yield queue.join()
+        log.append((now(), n, "served"))
+
+    def server():
+        while True:
+            advance(2.0)
+            queue.pop()
+
+    sim = Simulator()
+    for n in range(3):
+        sim.add(customer, n)
+    sim.add(server)
+    sim.run(10.0)
+    assert log == [
+        (1.0, 0, "counter"),
+        (1.0, 1, "counter"),
+        (2.0, 2, "counter"),
+        (2.0, 0, "served"),
+        (4.0, 1, "served"),
+        (6.0, 2, "served")
+    ]
+
+
+def test_generator_process_timeout():
+    queue = Queue()
+    signal = Signal().turn_off()
+    log = []
+
+    def impatient():
+        try:
+            yield queue.join(timeout=2.0)
+        except Timeout:
+            log.append(("queue timeout", now()))
+        try:
+            yield signal.wait(timeout=1.0)
+        except Timeout:
+            log.append(("signal timeout", now()))
+        yield signal.wait()
+        log.append(("signal", now()))
+
+    sim = Simulator()
+    sim.add(impatient)
+    sim.add_in(5.0, signal.turn_on)
+    sim.run()
+    assert log == [("queue timeout", 2.0), ("signal timeout", 3.0), ("signal", 5.0)]
+    assert queue.is_empty()
+
+
+def test_generator_process_select():
+    signals = [Signal().turn_off() for _ in range(3)]
+    log = []
+
+    def selector():
+        on = yield select(*signals)
+        log.append((now(), on))
+
+    sim = Simulator()
+    sim.add(selector)
+    sim.add_in(2.0, signals[1].turn_on)
+    sim.run()
+    assert log == [(2.0, [signals[1]])]
+
+
+def test_generator_process_local_and_tags():
+    log = []
+
+    @tagged(TestTag.ALICE)
+    def child():
+        local.name = "child"
+        yield 1.0
+        log.append((local.name, Process.current().has_tag(TestTag.ALICE), Process.current().has_tag(TestTag.BOB)))
+
+    def parent():
+        Process.current().tag_with(TestTag.BOB)
+        add(child)
+
+    sim = Simulator()
+    sim.add(parent)
+    sim.run(0.5)
+    assert sim.num_processes_tagged(TestTag.ALICE) == 1
+    sim.run()
+    assert log == [("child", True, True)]
+    assert sim.num_processes_tagged(TestTag.ALICE) == 0
+
+
+def test_generator_process_using_forbidden():
+    resource = Resource(1)
+
+    def body():
+        with resource.using():
+            yield 1.0
+
+    sim = Simulator()
+    sim.add(body)
+    with pytest.raises(TypeError):
+        sim.run()
+
+
+def test_generator_process_teardown():
+    log = []
+
+    def body():
+        try:
+            yield advance(10.0)
+        finally:
+            log.append(now())
+
+    with Simulator() as sim:
+        sim.add(body)
+        sim.run(5.0)
+    assert log == [5.0]
+
+
+def test_coroutine_process_advance():
+    log = []
+
+    async def wait_and_tell(delay):
+        await advance(delay)
+        return now()
+
+    async def body(name):
+        await advance(1.0)
+        log.append((now(), name))
+        moment = await wait_and_tell(2.0)
+        log.append((moment, name))
+
+    sim = Simulator()
+    proc = sim.add(body, "coro")
+    sim.run()
+    assert isinstance(proc, GeneratorProcess)
+    assert not isinstance(proc, greenlet.greenlet)
+    assert proc.dead
+    assert log == [(1.0, "coro"), (3.0, "coro")]
+
+
+def test_coroutine_process_interoperation():
+    queue = Queue()
+    counter = Resource(1)
+    signal = Signal().turn_off()
+    log = []
+
+    async def coroutine_customer(n):
+        await signal.wait()
+        await counter.take()
+        await advance(1.0)
+        counter.release()
+        log.append((now(), n, "counter"))
+        await queue.join()
+        log.append((now(), n, "served"))
+
+    def generator_customer(n):
+        yield signal.wait()
+        yield counter.take()
+        yield advance(1.0)
+        counter.release()
+        log.append((now(), n, "counter"))
+        yield queue.join()
+        log.append((now(), n, "served"))
+
+    def server():
+        advance(1.0)
+        signal.turn_on()
+        while True:
+            advance(5.0)
+            queue.pop()
+
+    sim = Simulator()
+    sim.add(coroutine_customer, 0)
+    sim.add(generator_customer, 1)
+    sim.add(coroutine_customer, 2)
+    sim.add(server)
+    sim.run(20.0)
+    assert log == [
+        (2.0, 0, "counter"),
+        (3.0, 1, "counter"),
+        (4.0, 2, "counter"),
+        (6.0, 0, "served"),
+        (11.0, 1, "served"),
+        (16.0, 2, "served")
+    ]
+
+
+def test_coroutine_process_interrupt_timeout():
+    signals = [Signal().turn_off() for _ in range(2)]
+    log = []
+
+    @tagged(TestTag.ALICE)
+    async def body():
+        try:
+            await advance(10.0)
+        except Interrupt:
+            log.append(("interrupted", now()))
+        try:
+            await select(*signals, timeout=2.0)
+        except Timeout:
+            log.append(("timeout", now()))
+        on = await select(*signals)
+        log.append((on, now(), Process.current().has_tag(TestTag.ALICE)))
+
+    sim = Simulator()
+    proc = sim.add(body)
+    sim.add_in(1.0, proc.interrupt)
+    sim.add_in(4.0, signals[0].turn_on)
+    sim.run()
+    assert log == [("interrupted", 1.0), ("timeout", 3.0), ([signals[0]], 4.0, True)]
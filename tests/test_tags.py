@@ -68,3 +68,94 @@ def test_tag_set_clear():
     tagged = TaggedObject(TestTag.ALICE, TestTag.BOB)
     tagged.clear_tags()
     assert tagged._tag_set == set()
+
+
+# More tags than fit in a 64-bit word.
+class ManyTags(Tags):
+    TAG0 = 0
+    TAG1 = 1
+    TAG2 = 2
+    TAG3 = 3
+    TAG4 = 4
+    TAG5 = 5
+    TAG6 = 6
+    TAG7 = 7
+    TAG8 = 8
+    TAG9 = 9
+    TAG10 = 10
+    TAG11 = 11
+    TAG12 = 12
+    TAG13 = 13
+    TAG14 = 14
+    TAG15 = 15
+    TAG16 = 16
+    TAG17 = 17
+    TAG18 = 18
+    TAG19 = 19
+    TAG20 = 20
+    TAG21 = 21
+    TAG22 = 22
+    TAG23 = 23
+    TAG24 = 24
+    TAG25 = 25
+    TAG26 = 26
+    TAG27 = 27
+    TAG28 = 28
+    TAG29 = 29
+    TAG30 = 30
+    TAG31 = 31
+    TAG32 = 32
+    TAG33 = 33
+    TAG34 = 34
+    TAG35 = 35
+    TAG36 = 36
+    TAG37 = 37
+    TAG38 = 38
+    TAG39 = 39
+    TAG40 = 40
+    TAG41 = 41
+    TAG42 = 42
+    TAG43 = 43
+    TAG44 = 44
+    TAG45 = 45
+    TAG46 = 46
+    TAG47 = 47
+    TAG48 = 48
+    TAG49 = 49
+    TAG50 = 50
+    TAG51 = 51
+    TAG52 = 52
+    TAG53 = 53
+    TAG54 = 54
+    TAG55 = 55
+    TAG56 = 56
+    TAG57 = 57
+    TAG58 = 58
+    TAG59 = 59
+    TAG60 = 60
+    TAG61 = 61
+    TAG62 = 62
+    TAG63 = 63
+    TAG64 = 64
+    TAG65 = 65
+    TAG66 = 66
+    TAG67 = 67
+    TAG68 = 68
+    TAG69 = 69
+
+
+def test_tag_many():
+    tagged = TaggedObject(*ManyTags)
+    assert tagged._tag_set == set(ManyTags)
+    tagged.untag(*[tag for n, tag in enumerate(ManyTags) if n % 2 == 0])
+    assert all(tagged.has_tag(tag) == (n % 2 == 1) for n, tag in enumerate(ManyTags))
+    assert set(tagged.iter_tags()) == set(tag for n, tag in enumerate(ManyTags) if n % 2 == 1)
+
+
+def test_tag_copy():
+    tagged = TaggedObject(TestTag.ALICE)
+    other = TaggedObject()
+    other._tags = tagged._tags
+    tagged.tag_with(TestTag.BOB)
+    assert other._tag_set == set([TestTag.ALICE])
+    assert tagged._tag_set == set([TestTag.ALICE, TestTag.BOB])